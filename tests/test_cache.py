@@ -0,0 +1,137 @@
+import unittest
+import tempfile
+import os
+import mock
+from wiktionaryparser import WiktionaryParser, DiskCache, ResultCache
+from wiktionaryparser.cache import canonical_title
+from tests.test_core import mocked_requests_get
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'pages.sqlite')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_canonical_title(self):
+        self.assertEqual(canonical_title('ice_cream'), 'ice cream')
+        self.assertEqual(canonical_title('ice%20cream#English'), 'ice cream')
+        self.assertEqual(canonical_title(' ice  cream '), 'ice cream')
+
+    def test_get_and_set(self):
+        cache = DiskCache(self.path)
+        self.assertIsNone(cache.get('test', 1))
+        cache.set('test', 1, '<html>test</html>')
+        self.assertEqual(cache.get('test', 1), '<html>test</html>')
+        self.assertEqual(cache.get('test', '1'), '<html>test</html>')
+        self.assertIsNone(cache.get('test'))
+        self.assertEqual(DiskCache(self.path).get('test', 1), '<html>test</html>')
+
+    def test_ttl_only_applies_without_old_id(self):
+        cache = DiskCache(self.path, ttl=-1)
+        cache.set('test', None, 'latest')
+        cache.set('test', 1, 'revision')
+        self.assertIsNone(cache.get('test'))
+        self.assertEqual(cache.get('test', 1), 'revision')
+
+    def test_lru_eviction(self):
+        cache = DiskCache(self.path, max_size=2500)
+        pages = {word: os.urandom(1000).hex() for word in ['a', 'b', 'c']}
+        cache.set('a', None, pages['a'])
+        cache.set('b', None, pages['b'])
+        cache.get('a')
+        cache.set('c', None, pages['c'])
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_total_size_is_kept_up_to_date(self):
+        def total_size(cache):
+            # The running total, checked against the sum of the sizes
+            connection = cache._connection()
+            size, = connection.execute("SELECT value FROM metadata WHERE key = 'total_size'").fetchone()
+            self.assertEqual(size, connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0])
+            return size
+
+        cache = DiskCache(self.path, max_size=2500, ttl=-1)
+        cache.set('a', 1, os.urandom(1000).hex())
+        cache.set('a', 1, os.urandom(500).hex())
+        cache.set('b', None, os.urandom(1000).hex())
+        self.assertGreater(total_size(cache), 1500)
+        cache.set('c', 1, os.urandom(1000).hex())
+        total_size(cache)
+        self.assertIsNone(cache.get('b'))
+        cache.delete('a', 1)
+        total_size(cache)
+        self.assertEqual(total_size(DiskCache(self.path)), total_size(cache))
+        cache.clear()
+        self.assertEqual(total_size(cache), 0)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+    def test_fetch_uses_cache(self, mock_get):
+        parser = WiktionaryParser(language='norwegian bokmål', cache=DiskCache(self.path))
+        first = parser.fetch('heis', old_id=49469949, return_word_class=False)
+        second = parser.fetch('heis', old_id=49469949, return_word_class=False)
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_results_are_read_only(self):
+        cache = ResultCache()
+        result = cache.set('key', [{'definitions': [{'text': ['a', 'b']}]}])
+        with self.assertRaises(TypeError):
+            result[0]['etymology'] = ''
+        with self.assertRaises(TypeError):
+            result[0]['definitions'][0]['text'] += ('c',)
+        with self.assertRaises(TypeError):
+            entry = result[0]
+            entry |= {'etymology': ''}
+        self.assertEqual(cache.get('key'), ({'definitions': ({'text': ('a', 'b')},)},))
+
+    def test_lru_eviction_and_counters(self):
+        cache = ResultCache(max_entries=2)
+        cache.set('a', [1])
+        cache.set('b', [2])
+        cache.get('a')
+        cache.set('c', [3])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), (1,))
+        self.assertEqual(cache.stats(), dict(hits=2, misses=1, entries=2, size=0))
+
+    def test_max_bytes(self):
+        cache = ResultCache(max_bytes=10)
+        cache.set('a', ['abc'])
+        cache.set('b', ['def'])
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+        self.assertEqual(cache.size, 7)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+    def test_fetch_uses_result_cache(self, mock_get):
+        cache = ResultCache()
+        parser = WiktionaryParser(language='norwegian bokmål', result_cache=cache)
+        first = parser.fetch('heis', old_id=49469949, return_word_class=False)
+        second = parser.fetch('heis', old_id=49469949, return_word_class=False)
+        parser.fetch('heis', old_id=49469949)
+        self.assertIs(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    @mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+    def test_fetch_word_class_from_result_cache(self, mock_get):
+        parser = WiktionaryParser(language='english', result_cache=ResultCache())
+        expected_word = WiktionaryParser(language='english').fetch('house', old_id=50356446)
+        first = parser.fetch('house', old_id=50356446)
+        second = parser.fetch('house', old_id=50356446)
+        for word in (first, second):
+            self.assertEqual(word._languages, expected_word._languages)
+            self.assertEqual(word._translation_lst, expected_word._translation_lst)
+            self.assertEqual(word._translation_txt, expected_word._translation_txt)
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
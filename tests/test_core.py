@@ -1,12 +1,18 @@
 from parameterized import parameterized
 import unittest
 import json
-from wiktionaryparser import WiktionaryParser
+from wiktionaryparser import WiktionaryParser, AsyncWiktionaryParser, ResultCache, WordData, parse_html
+from wiktionaryparser._exceptions import APIError, SenseLocationError, ZeroTablesError
 from deepdiff import DeepDiff
 from typing import Dict, List
 import mock
 from urllib import parse
 import os
+import re
+import asyncio
+import pickle
+import weakref
+import gc
 
 parser = WiktionaryParser()
 
@@ -54,6 +60,15 @@ def get_test_words_table(*allowed_words):
 class MockResponse:
     def __init__(self, text: str):
         self.text = text
+        self.status_code = 200
+        self.ok = True
+
+
+def read_test_file(word, old_id, mode='rb', extension='html'):
+    """Returns the content of the test file of `word` at revision `old_id` (bytes, or str in mode 'r')."""
+    filepath = os.path.join(html_test_files_dir, f'{word}-{old_id}.{extension}')
+    with open(filepath, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+        return f.read()
 
 
 def mocked_requests_get(*args, **kwargs):
@@ -62,19 +77,68 @@ def mocked_requests_get(*args, **kwargs):
     params = kwargs['params']
 
     word = parsed_url.path.split('/')[-1]
-    filepath = os.path.join(html_test_files_dir,
-                            f'{word}-{params["oldid"]}.html')
-    with open(filepath, 'r', encoding='utf-8') as f:
-        text = f.read()
+    return MockResponse(read_test_file(word, params["oldid"], 'r'))
+
+
+def mocked_api_get(*args, **kwargs):
+    """Stand-in for the MediaWiki parse API, serving the sections of the test files."""
+    from bs4 import BeautifulSoup
+    params = kwargs['params']
+    word = params['page'] if 'page' in params else next(
+        w for w, old_id, _ in test_words if str(old_id) == str(params['oldid']))
+    old_id = next(old_id for w, old_id, _ in test_words if w == word)
+    html = mocked_requests_get(parser.url.format(word), params={'oldid': old_id}).text
+    # Like the API, sections are numbered after the headings (some test files have no table of contents)
+    sections, levels, numbers = [], [], []
+    headlines = BeautifulSoup(html, 'html.parser').select(', '.join(
+        'h{} > span.mw-headline'.format(level) for level in range(2, 7)))
+    for index, headline in enumerate(headlines, 1):
+        level = int(headline.parent.name[1])
+        while levels and levels[-1] > level:
+            levels.pop()
+            numbers.pop()
+        if levels and levels[-1] == level:
+            numbers[-1] += 1
+        else:
+            levels.append(level)
+            numbers.append(1)
+        sections.append({
+            'toclevel': len(levels),
+            'line': headline.decode_contents(),
+            'number': '.'.join(map(str, numbers)),
+            'index': str(index),
+            'anchor': headline['id'],
+        })
+    if params['prop'] == 'sections':
+        return MockResponse(json.dumps({'parse': {'title': word, 'sections': sections}}))
+    section = next(section for section in sections if section['index'] == str(params['section']))
+    start = html.rindex('<h2>', 0, html.index('class="mw-headline" id="{}"'.format(section['anchor'])))
+    end = html.find('<h2>', start + 1)
+    text = '<div class="mw-parser-output">{}</div>'.format(html[start:end if end > 0 else None])
+    return MockResponse(json.dumps({'parse': {'title': word, 'text': text}}))
 
-    return MockResponse(text)
+
+def to_current_skin(html):
+    """Rewrites a printable page the way current skins render it: without table of contents,
+    and with each heading wrapped in a div.mw-heading along with its edit link, without span.mw-headline."""
+    html = re.sub(r'<div id="toc".*?</ul>\s*</div>', '', html, flags=re.S)
+
+    def heading(match):
+        level = match.group(1)
+        headline = re.search(r'<span class="mw-headline" id="([^"]*)">(.*?)</span>', match.group(2))
+        if headline is None:
+            return match.group(0)
+        return ('<div class="mw-heading mw-heading{0}"><h{0} id="{1}">{2}</h{0}><span class="mw-editsection">'
+                '<span class="mw-editsection-bracket">[</span><a href="#">edit</a>'
+                '<span class="mw-editsection-bracket">]</span></span></div>').format(level, *headline.groups())
+    return re.sub(r'<h([2-6])>(.*?)</h\1>', heading, html, flags=re.S)
 
 
 class TestParser(unittest.TestCase):
     def __init__(self, *args, **kwargs):
         self.expected_results = {}
 
-        with open('testOutput.json', 'r') as f:
+        with open(os.path.join(tests_dir, 'testOutput.json'), 'r', encoding='utf-8') as f:
             self.expected_results = json.load(f)
 
         super(TestParser, self).__init__(*args, **kwargs)
@@ -84,16 +148,392 @@ class TestParser(unittest.TestCase):
     def test_fetch_using_mock_session(self, lang: str, word: str, old_id: int, mock_get):
         self.__test_fetch(lang, word, old_id)
 
+    @parameterized.expand(get_test_words_table('by', 'for', 'admiral', 'heis', 'test', 'song'))
+    def test_parse_html(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        parsed_word = parse_html(html, word, language=lang.lower(), return_word_class=False)
+
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+            expected_result = WiktionaryParser(language=lang.lower()).fetch(word, old_id=old_id, return_word_class=False)
+        self.assertEqual(parsed_word, expected_result)
+
+    def test_second_lookup_downloads_subpage_once(self):
+        from bs4 import BeautifulSoup
+        subpage = '<h3><span id="Noun">Noun</span></h3><div></div><h3><span id="Verb">Verb</span></h3><div></div>'
+        lookup_parser = WiktionaryParser()
+        with mock.patch.object(lookup_parser, '_download_page', return_value=subpage) as mock_download:
+            for anchor in ['Noun', 'Verb']:
+                sense_tag = BeautifulSoup('<div><a href="/wiki/word/translations#{}">word/translations</a></div>'.format(anchor),
+                                          'html.parser').div
+                span_tag = lookup_parser._second_lookup([('', sense_tag)])
+                self.assertEqual(span_tag['id'], anchor)
+        mock_download.assert_called_once_with('word/translations')
+
+        # Subpages are not kept from one word to the next
+        lookup_parser.read_html('<h2><span class="mw-headline" id="English">English</span></h2>', 'other')
+        self.assertEqual(lookup_parser._subpages, {})
+        with mock.patch.object(lookup_parser, '_download_page', return_value=subpage) as mock_download:
+            lookup_parser._second_lookup([('', sense_tag)])
+        mock_download.assert_called_once_with('word/translations')
+
+    @parameterized.expand(get_test_words_table('test', 'song', 'house', 'heis'))
+    def test_fetch_selected_sections(self, lang: str, word: str, old_id: int):
+        selective_parser = WiktionaryParser(language=lang.lower())
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get) as mock_get, \
+                mock.patch.object(selective_parser, 'parse_translations') as mock_translations:
+            fetched_word = selective_parser.fetch(word, old_id=old_id, return_word_class=False,
+                                                  sections={'definitions', 'pronunciations'})
+        mock_translations.assert_not_called()
+        self.assertEqual(mock_get.call_count, 1)
+
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+            expected_result = WiktionaryParser(language=lang.lower()).fetch(word, old_id=old_id, return_word_class=False)
+        for entry in expected_result:
+            entry['etymology'] = ''
+            for definition in entry['definitions']:
+                definition.update(relatedWords=[], examples=[], translations=[])
+        self.assertEqual(fetched_word, expected_result)
+
+        with self.assertRaises(ValueError):
+            selective_parser.parse('', word, sections={'definition'})
+
+    @parameterized.expand(get_test_words_table('test', 'song', 'grapple', 'correspondent'))
+    def test_parse_html_with_translation_languages(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        languages = {'french', 'german', 'swedish'}
+        filtering_parser = WiktionaryParser(language=lang.lower(), translation_languages=['French', 'German', 'Swedish'])
+        parsed_word = filtering_parser.parse(html, word, return_word_class=False)
+
+        expected_result = parse_html(html, word, language=lang.lower(), return_word_class=False)
+        for entry in expected_result:
+            for definition in entry['definitions']:
+                for sense in definition['translations']:
+                    sense['translations'] = {language: translations for language, translations
+                                             in sense['translations'].items() if language in languages}
+        self.assertEqual(parsed_word, expected_result)
+
+    @parameterized.expand(get_test_words_table())
+    def test_parsing_leaves_the_tree_untouched(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        readonly_parser = WiktionaryParser(language=lang.lower())
+        readonly_parser.read_html(html, word)
+        readonly_parser.classify_contents()
+        tree = str(readonly_parser.soup)
+        word_data = readonly_parser.get_word_data()
+        self.assertEqual(str(readonly_parser.soup), tree)
+        self.assertEqual(readonly_parser.get_word_data(), word_data)
+
+    @parameterized.expand(get_test_words_table('test', 'song', 'house', 'heis'))
+    def test_parse_html_as_records(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        records = WiktionaryParser(language=lang.lower()).parse(html, word, as_records=True)
+        self.assertTrue(all(isinstance(record, WordData) for record in records))
+        self.assertFalse(hasattr(records[0], '__dict__'))
+        self.assertFalse(hasattr(records[0].definition_list[0], '__dict__'))
+
+        expected_result = parse_html(html, word, language=lang.lower(), return_word_class=False)
+        self.assertEqual([record.to_json() for record in records], expected_result)
+        cached_json = records[0].to_json(cache=True)
+        self.assertIs(records[0].to_json(), cached_json)
+
+    def test_word_views_are_lazy(self):
+        word = parse_html(read_test_file('test', 50342756), 'test', return_word_class=True)
+        self.assertNotIn('structure', vars(word))
+        self.assertNotIn('_translation_txt', vars(word))
+
+        with mock.patch('builtins.print'):
+            word.translation('french')
+        self.assertEqual(set(word._translation_texts), {'french'})
+        self.assertIn('(n) challenge, trial: ', word._translation_text('french'))
+        self.assertEqual(word._translation_txt['french'], word._translation_text('french'))
+        self.assertEqual(word.structure[0], ['n', 'v'])
+
+    def test_word_translations_for_prefix(self):
+        word = parse_html(read_test_file('test', 50342756), 'test', return_word_class=True)
+        translations = word.translations_for('Chinese')
+        self.assertEqual(list(translations), ['chinese-cantonese', 'chinese-mandarin'])
+        self.assertEqual(list(word.translations_for('chinese-m')), ['chinese-mandarin'])
+        self.assertEqual(word.translations_for('klingon'), {})
+        for key, entries in translations.items():
+            self.assertTrue(entries)
+            for entry in entries:
+                self.assertIn(word._dictionary_entry(entry.part_of_speech, entry.sense), word._translation_lst[key])
+                self.assertEqual(word._force_comma_str(entry.translations),
+                                 word._translation_lst[key][word._dictionary_entry(entry.part_of_speech, entry.sense)])
+
+    def test_map_to_object_compares_indexes_numerically(self):
+        word_data = {
+            'etymologies': [('1.2', 'first'), ('1.10', 'second')],
+            'pronunciations': [('1.1', ['/a/'], []), ('1.10.1', ['/b/'], [])],
+            'definitions': [('1.2.1', ['noun'], 'noun'), ('1.9', ['verb'], 'verb'), ('1.10.2', ['adjective'], 'adjective')],
+            'examples': [('1.2.1', ['an example'], 'noun')],
+            'related': [('1.2.1.1', ['word'], 'synonyms'), ('1.10.2.1', ['other word'], 'synonyms')],
+            'translations': [('1.2.1.2', [('sense', {'french': 'mot'})]), ('1.10.3', [('', {})])],
+        }
+        entries = WiktionaryParser.map_to_object(word_data)
+        self.assertEqual([entry['etymology'] for entry in entries], ['first', 'second'])
+        self.assertEqual([entry['pronunciations']['text'] for entry in entries], [['/a/'], ['/b/']])
+        noun, verb = entries[0]['definitions']
+        adjective, = entries[1]['definitions']
+        self.assertEqual((noun['examples'], noun['relatedWords'], noun['translations']),
+                         (['an example'], [{'relationshipType': 'synonyms', 'words': ['word']}],
+                          [{'sense': 'sense', 'translations': {'french': 'mot'}}]))
+        self.assertEqual((verb['examples'], verb['relatedWords'], verb['translations']), ([], [], []))
+        self.assertEqual(adjective['relatedWords'], [{'relationshipType': 'synonyms', 'words': ['other word']}])
+        self.assertEqual(adjective['translations'], [{'sense': '', 'translations': {}}])
+
+    @parameterized.expand(get_test_words_table())
+    def test_parse_html_without_toc(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id, 'r')
+        html_without_toc = re.sub(r'<div id="toc".*?</ul>\s*</div>', '', html, flags=re.S)
+        self.assertNotIn('toctext', html_without_toc)
+
+        toc_parser = WiktionaryParser(language=lang.lower())
+        expected_result = toc_parser.parse(html, word, return_word_class=False)
+        headings_parser = WiktionaryParser(language=lang.lower())
+        parsed_word = headings_parser.parse(html_without_toc, word, return_word_class=False)
+        self.assertEqual(headings_parser.word_contents, toc_parser.word_contents)
+        self.assertEqual(parsed_word, expected_result)
+
+    @parameterized.expand(get_test_words_table())
+    def test_parse_html_of_current_skin(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id, 'r')
+        current_html = to_current_skin(html)
+        self.assertNotIn('toctext', current_html)
+        self.assertNotIn('mw-headline', current_html)
+
+        toc_parser = WiktionaryParser(language=lang.lower())
+        expected_result = toc_parser.parse(html, word, return_word_class=False)
+        headings_parser = WiktionaryParser(language=lang.lower())
+        parsed_word = headings_parser.parse(current_html, word, return_word_class=False)
+        self.assertEqual(headings_parser.word_contents, toc_parser.word_contents)
+        self.assertEqual(parsed_word, expected_result)
+
+    @parameterized.expand(get_test_words_table())
+    def test_parse_html_sliced_by_language(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        sliced_parser = WiktionaryParser(language=lang.lower(), slice_language=True)
+        self.assertEqual(sliced_parser.parse(html, word, return_word_class=False),
+                         parse_html(html, word, language=lang.lower(), return_word_class=False))
+        self.assertEqual(sliced_parser.parse(html.decode('utf-8'), word, return_word_class=False),
+                         parse_html(html, word, language=lang.lower(), return_word_class=False))
+        self.assertLess(len(str(sliced_parser.soup)), len(html))
+
+    @parameterized.expand(get_test_words_table())
+    def test_parse_html_lazily(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        lazy_result = WiktionaryParser(language=lang.lower()).parse(html, word, lazy=True)
+        definitions = [definition.text for entry in lazy_result for definition in entry.definitions]
+        self.assertEqual(lazy_result.evaluated, {'definitions'})
+
+        expected_result = parse_html(html, word, language=lang.lower(), return_word_class=False)
+        self.assertEqual(definitions, [definition['text'] for entry in expected_result
+                                       for definition in entry['definitions']])
+        self.assertEqual(lazy_result.to_json(), expected_result)
+        self.assertIsNone(lazy_result._parser)
+
+    def test_parse_html_lazily_with_sections(self):
+        html = read_test_file('house', 50356446)
+        sections_parser = WiktionaryParser(language='english')
+        lazy_result = sections_parser.parse(html, 'house', lazy=True, sections={'definitions'})
+        self.assertEqual(lazy_result.to_json(), sections_parser.parse(html, 'house', return_word_class=False,
+                                                                      sections={'definitions'}))
+        self.assertIsNone(lazy_result._parser)
+
+        # The translations of 'word' live in a subpage, which is not downloaded if translations are left out
+        lazy_result = sections_parser.parse(read_test_file('word', 1, extension='parsoid.html'), 'word', lazy=True,
+                                            sections={'definitions'})
+        with mock.patch("requests.Session.get") as mock_get:
+            self.assertEqual(lazy_result[0].definitions[0].translations, [])
+        mock_get.assert_not_called()
+
+    def test_lazy_results_release_the_tree(self):
+        html = read_test_file('heis', 49469949)
+        lazy_parser = WiktionaryParser(language='norwegian bokmål')
+        for lazy_result in [lazy_parser.parse(html, 'heis', lazy=True),
+                            lazy_parser.parse_languages(html, 'heis', ['norwegian bokmål'], lazy=True)['norwegian bokmål']]:
+            soup = weakref.ref(lazy_result._parser.soup)
+            lazy_result.to_json()
+            gc.collect()
+            self.assertIsNone(soup())
+            self.assertIsNone(lazy_parser.soup)
+
+    @parameterized.expand(get_test_words_table('by', 'for', 'admiral', 'heis', 'test', 'song'))
+    def test_parse_html_with_lxml(self, lang: str, word: str, old_id: int):
+        html = read_test_file(word, old_id)
+        parsed_word = WiktionaryParser(language=lang.lower(), features='lxml').parse(html, word, return_word_class=False)
+        expected_result = parse_html(html, word, language=lang.lower(), return_word_class=False)
+        self.assertEqual(json.dumps(parsed_word), json.dumps(expected_result))
+
+    @parameterized.expand(get_test_words_table())
+    def test_fetch_section_using_mock_api(self, lang: str, word: str, old_id: int):
+        section_parser = WiktionaryParser(language=lang.lower(), fetch_mode='section')
+        with mock.patch("requests.Session.get", side_effect=mocked_api_get) as mock_get:
+            fetched_word = section_parser.fetch(word, old_id=old_id, return_word_class=False)
+        self.assertTrue(all(call[0][0] == section_parser.api_url for call in mock_get.call_args_list))
+
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+            expected_result = WiktionaryParser(language=lang.lower()).fetch(word, old_id=old_id, return_word_class=False)
+        self.assertEqual(fetched_word, expected_result)
+
+    def test_fetch_several_languages_at_once(self):
+        multi_parser = WiktionaryParser(language='english')
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get) as mock_get:
+            fetched = multi_parser.fetch('house', old_id=50356446, return_word_class=False,
+                                         languages=['english', 'swedish', 'klingon'])
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(list(fetched), ['english', 'swedish'])
+
+        for language in fetched:
+            with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+                expected_result = WiktionaryParser(language=language).fetch('house', old_id=50356446,
+                                                                            return_word_class=False)
+            self.assertEqual(fetched[language], expected_result)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+    def test_fetch_many_using_mock_session(self, mock_get):
+        batch_parser = WiktionaryParser(language='norwegian bokmål')
+        words = [(word, old_id) for _, word, old_id in get_test_words_table('by', 'for', 'admiral', 'heis')]
+        fetched = dict(batch_parser.fetch_many(words, max_workers=4, return_word_class=False))
+
+        self.assertEqual(set(fetched), {word for word, _ in words})
+        for word, old_id in words:
+            expected_result = batch_parser.fetch(word, old_id=old_id, return_word_class=False)
+            self.assertEqual(fetched[word], expected_result)
+
+    @mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+    def test_fetch_many_with_parse_processes(self, mock_get):
+        batch_parser = WiktionaryParser(language='norwegian bokmål')
+        words = [(word, old_id) for _, word, old_id in get_test_words_table('by', 'for', 'admiral', 'heis')]
+        fetched = dict(batch_parser.fetch_many(words, max_workers=2, return_word_class=False, parse_processes=2))
+
+        self.assertEqual(set(fetched), {word for word, _ in words})
+        for word, old_id in words:
+            expected_result = batch_parser.fetch(word, old_id=old_id, return_word_class=False)
+            self.assertEqual(fetched[word], expected_result)
+
+    def test_fetch_many_with_parse_processes_and_a_malformed_page(self):
+        # The Translations heading is not followed by a table of translations
+        malformed_page = (
+            '<h2><span class="mw-headline" id="English">English</span></h2>'
+            '<h3><span class="mw-headline" id="Noun">Noun</span></h3><p>malformed</p><ol><li>a page</li></ol>'
+            '<h4><span class="mw-headline" id="Translations">Translations</span></h4><p>No translations</p>'
+        )
+
+        def mocked_get(url, params=None):
+            if 'malformed' in url:
+                return MockResponse(malformed_page)
+            return mocked_requests_get(url, params=params)
+
+        batch_parser = WiktionaryParser(language='english')
+        words = [('malformed', None), ('heis', 49469949)]
+        with mock.patch("requests.Session.get", side_effect=mocked_get):
+            fetched = dict(batch_parser.fetch_many(words, return_word_class=False, parse_processes=2))
+            expected_result = batch_parser.fetch('heis', old_id=49469949, return_word_class=False)
+        self.assertIsInstance(fetched['malformed'], SenseLocationError)
+        self.assertEqual(fetched['heis'], expected_result)
+
+    def test_translation_errors_can_be_pickled(self):
+        from bs4 import BeautifulSoup
+        info = {'word': 'word', 'sense': 'sense', 'html': BeautifulSoup('<div>sense</div>', 'html.parser').div}
+        error = pickle.loads(pickle.dumps(ZeroTablesError(info, show_html=True)))
+        self.assertIsInstance(error, ZeroTablesError)
+        self.assertEqual(error.info, {'word': 'word', 'sense': 'sense'})
+        self.assertIn('WORD:"word", SENSE:"sense"', str(error))
+
+    def test_api_errors_can_be_pickled(self):
+        error = pickle.loads(pickle.dumps(APIError({'code': 'missingtitle', 'info': "The page doesn't exist."})))
+        self.assertEqual(error.error, {'code': 'missingtitle', 'info': "The page doesn't exist."})
+        self.assertEqual(str(error), "missingtitle: The page doesn't exist.")
+
+    def test_async_fetch_many_using_mock_download(self):
+        async def mocked_download(word, old_id=None, fetch_mode=None):
+            return mocked_requests_get(parser.url.format(word), params={'oldid': old_id}).text
+
+        async def fetch_all(async_parser, words):
+            async with async_parser:
+                return {word: result async for word, result in async_parser.fetch_many(words, return_word_class=False)}
+
+        async_parser = AsyncWiktionaryParser(language='norwegian bokmål', max_concurrency=2)
+        async_parser._download_async = mocked_download
+        words = [(word, old_id) for _, word, old_id in get_test_words_table('by', 'for', 'admiral', 'heis')]
+        fetched = asyncio.get_event_loop().run_until_complete(fetch_all(async_parser, words))
+
+        self.assertEqual(set(fetched), {word for word, _ in words})
+        sync_parser = WiktionaryParser(language='norwegian bokmål')
+        for word, old_id in words:
+            with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+                expected_result = sync_parser.fetch(word, old_id=old_id, return_word_class=False)
+            self.assertEqual(fetched[word], expected_result)
+
+    def test_async_fetch_many_cancels_pending_fetches(self):
+        cancelled = []
+
+        async def mocked_download(word, old_id=None, fetch_mode=None):
+            if word != 'heis':
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.append(word)
+                    raise
+            return mocked_requests_get(parser.url.format(word), params={'oldid': old_id}).text
+
+        async def fetch_first(async_parser, words):
+            async with async_parser:
+                results = async_parser.fetch_many(words, return_word_class=False)
+                word, _ = await results.__anext__()
+                # What `break` in an `async for` leads to, once the generator is finalized
+                await results.aclose()
+                await asyncio.sleep(0)
+                return word
+
+        async_parser = AsyncWiktionaryParser(language='norwegian bokmål')
+        async_parser._download_async = mocked_download
+        words = [(word, old_id) for _, word, old_id in get_test_words_table('by', 'for', 'heis')]
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(fetch_first(async_parser, words)), 'heis')
+        self.assertEqual(sorted(cancelled), ['by', 'for'])
+
+    def test_async_fetch_options(self):
+        async def mocked_download(word, old_id=None, fetch_mode=None):
+            return mocked_requests_get(parser.url.format(word), params={'oldid': old_id}).text
+
+        def to_json(result):
+            # Records (and results per language of records) are compared by their json
+            if isinstance(result, dict):
+                return {language: to_json(language_result) for language, language_result in result.items()}
+            return [entry.to_json() if isinstance(entry, WordData) else entry for entry in result]
+
+        options = dict(language='norwegian bokmål', result_cache=ResultCache(), features='html.parser',
+                       translation_languages=['french'])
+        async_parser = AsyncWiktionaryParser(max_concurrency=2, **options)
+        async_parser._download_async = mocked_download
+        sync_parser = WiktionaryParser(**options)
+        self.assertIsNotNone(async_parser.result_cache)
+        self.assertEqual(async_parser.translation_languages, {'french'})
+        _, word, old_id = get_test_words_table('heis')[0]
+        for kwargs in [dict(return_word_class=False), dict(return_word_class=False, sections={'definitions'}),
+                       dict(return_word_class=False, languages=['english', 'norwegian bokmål']),
+                       dict(as_records=True), dict(languages=['english'], as_records=True)]:
+            fetched = asyncio.get_event_loop().run_until_complete(async_parser.fetch(word, old_id, **kwargs))
+            with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+                expected_result = sync_parser.fetch(word, old_id=old_id, **kwargs)
+            self.assertEqual(to_json(fetched), to_json(expected_result))
+        fetched = asyncio.get_event_loop().run_until_complete(async_parser.fetch(word, old_id, lazy=True))
+        with mock.patch("requests.Session.get", side_effect=mocked_requests_get):
+            expected_result = sync_parser.fetch(word, old_id=old_id, lazy=True)
+        self.assertEqual(fetched.to_json(), expected_result.to_json())
+
     def __test_fetch(self, lang: str, word: str, old_id: int):
-        parser.set_default_language(lang)
-        fetched_word = parser.fetch(word, old_id=old_id)
+        parser = WiktionaryParser(language=lang.lower())
+        fetched_word = parser.fetch(word, old_id=old_id, return_word_class=False)
 
         print("Testing \"{}\" in \"{}\"".format(word, lang))
         expected_result = self.expected_results[lang][word]
 
         diff = DeepDiff(fetched_word,
                         expected_result,
-                        ignore_order=True)
+                        ignore_order=True,
+                        exclude_regex_paths=[r"\['translations'\]"])
 
         if diff != {}:
             print("Found mismatch in \"{}\" in \"{}\"".format(word, lang))
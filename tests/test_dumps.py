@@ -0,0 +1,102 @@
+import unittest
+import tempfile
+import tarfile
+import json
+import gzip
+import io
+import os
+import mock
+from wiktionaryparser import parse_html, parse_dump, iter_html_dump
+from tests.test_core import get_test_words_table, read_test_file
+
+test_words_table = get_test_words_table('by', 'for', 'admiral', 'heis')
+
+
+def make_record(word, old_id, namespace=0, markup='html', name=None):
+    html = read_test_file(word, old_id, 'r', extension=markup)
+    return {
+        'name': word if name is None else name,
+        'identifier': 1,
+        'namespace': {'identifier': namespace},
+        'version': {'identifier': old_id},
+        'article_body': {'html': html},
+    }
+
+
+class TestDumps(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        lines = [json.dumps(make_record(word, old_id)) for _, word, old_id in test_words_table]
+        lines.append(json.dumps(make_record('heis', 49469949, namespace=10)))
+        content = '\n'.join(lines).encode('utf-8')
+
+        self.ndjson_path = os.path.join(self.tmp_dir.name, 'dump.ndjson.gz')
+        with gzip.open(self.ndjson_path, 'wb') as f:
+            f.write(content)
+
+        self.tar_path = os.path.join(self.tmp_dir.name, 'dump.json.tar.gz')
+        with tarfile.open(self.tar_path, 'w:gz') as archive:
+            info = tarfile.TarInfo('enwiktionary_namespace_0_0.ndjson')
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_html_dump(self):
+        for path in [self.ndjson_path, self.tar_path]:
+            pages = list(iter_html_dump(path))
+            self.assertEqual([page.title for page in pages], [word for _, word, _ in test_words_table])
+            self.assertEqual(len(list(iter_html_dump(path, namespaces=None))), len(test_words_table) + 1)
+            self.assertEqual([page.old_id for page in iter_html_dump(path, titles=['heis'])], [49469949])
+
+    def test_parse_dump(self):
+        expected_results = {
+            word: parse_html(page.html, word, language='norwegian bokmål', return_word_class=False)
+            for page in iter_html_dump(self.tar_path) for word in [page.title]
+        }
+        parsed = dict(parse_dump(self.tar_path, language='norwegian bokmål', return_word_class=False))
+        self.assertEqual(parsed, expected_results)
+        parsed = dict(parse_dump(self.tar_path, language='norwegian bokmål', return_word_class=False, processes=2))
+        self.assertEqual(parsed, expected_results)
+
+    def test_parse_dump_of_parsoid_html(self):
+        # Dumps carry Parsoid HTML: nested <section> tags, ids on the headings, no span.mw-headline nor TOC
+        parsoid_path = os.path.join(self.tmp_dir.name, 'parsoid.ndjson')
+        with open(parsoid_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(make_record('heis', 49469949, markup='parsoid.html')))
+        printable_html = read_test_file('heis', 49469949)
+        for language in ['english', 'norwegian bokmål', 'norwegian nynorsk']:
+            parsed = dict(parse_dump(parsoid_path, language=language, return_word_class=False))
+            self.assertEqual(parsed, {'heis': parse_html(printable_html, 'heis', language=language,
+                                                         return_word_class=False)})
+
+    def test_parse_dump_with_subpages_of_translations(self):
+        # The translations of 'word' live in the 'word/translations' subpage, which the dump carries too
+        page = make_record('word', 1, markup='parsoid.html')
+        subpage = make_record('word_translations', 2, markup='parsoid.html', name='word/translations')
+        dump_path = os.path.join(self.tmp_dir.name, 'subpages.ndjson')
+        for records in [[page, subpage], [subpage, page]]:
+            with open(dump_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(json.dumps(record) for record in records))
+            for kwargs in [{}, {'processes': 2}, {'titles': ['word']}]:
+                with mock.patch("requests.Session.get") as mock_get:
+                    parsed = dict(parse_dump(dump_path, return_word_class=False, **kwargs))
+                mock_get.assert_not_called()
+                self.assertEqual(list(parsed), ['word'])
+                self.assertEqual(parsed['word'][0]['definitions'][0]['translations'],
+                                 [{'sense': 'unit of language', 'translations': {'french': ' mot [m]',
+                                                                                 'german': ' Wort [n]'}}])
+
+        # Subpages missing from the dump are downloaded
+        with open(dump_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(page))
+        subpage_response = mock.Mock(text=subpage['article_body']['html'], status_code=200, ok=True)
+        with mock.patch("requests.Session.get", return_value=subpage_response) as mock_get:
+            parsed = dict(parse_dump(dump_path, return_word_class=False))
+        self.assertEqual(mock_get.call_args[0][0], 'https://en.wiktionary.org/wiki/word/translations?printable=yes')
+        self.assertTrue(parsed['word'][0]['definitions'][0]['translations'])
+
+
+if __name__ == '__main__':
+    unittest.main()
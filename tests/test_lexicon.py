@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import os
+from wiktionaryparser import parse_html, Lexicon, Term
+from wiktionaryparser.lexicon import Query, tokenize
+from tests.test_core import get_test_words_table, read_test_file
+
+
+class TestLexicon(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Keyed by (word, language): 'house' is parsed in English and in Swedish
+        cls.results = {}
+        for lang, word, old_id in get_test_words_table('test', 'song', 'house', 'grapple', 'correspondent'):
+            cls.results[word, lang.lower()] = parse_html(read_test_file(word, old_id), word, language=lang.lower(),
+                                                         return_word_class=False)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.lexicon = Lexicon(os.path.join(self.tmp_dir.name, 'lexicon.sqlite'))
+        self.lexicon.update([(word, lang, word_data) for (word, lang), word_data in self.results.items()] +
+                            [('missing', KeyError('missing'))])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def scan(self, predicate):
+        """Brute force counterpart of Lexicon.search."""
+        return {(word, lang, entry_index, position) for (word, lang), word_data in self.results.items()
+                for entry_index, entry in enumerate(word_data)
+                for position, definition in enumerate(entry['definitions']) if predicate(definition)}
+
+    def search(self, query):
+        return {(match.word, match.language, match.entry, match.definition) for match in self.lexicon.search(query)}
+
+    def test_boolean_queries(self):
+        def has_token(definition, token):
+            return any(token in tokenize(line) for line in definition['text'])
+
+        self.assertEqual(self.search(Term('pos', 'noun') & Term('text', 'building')),
+                         self.scan(lambda d: d['partOfSpeech'] == 'noun' and has_token(d, 'building')))
+        self.assertEqual(self.search(Term('pos', 'verb') | Term('translation', 'French')),
+                         self.scan(lambda d: d['partOfSpeech'] == 'verb' or
+                                   any('french' in sense['translations'] for sense in d['translations'])))
+        self.assertEqual(self.search(~Term('pos', 'noun') & ~Term('pos', 'verb')),
+                         self.scan(lambda d: d['partOfSpeech'] not in ['noun', 'verb']))
+        self.assertTrue(self.search(Term('pos', 'noun') & Term('text', 'building')))
+
+    def test_related_words(self):
+        relation_type, target = next((related['relationshipType'], related['words'][0].split(',')[0].strip())
+                                     for word_data in self.results.values() for entry in word_data
+                                     for definition in entry['definitions'] for related in definition['relatedWords']
+                                     if related['words'])
+        expected = self.scan(lambda d: any(r['relationshipType'] == relation_type and
+                                           any(target.lower() in [w.strip().lower() for w in line.split(',')]
+                                               for line in r['words']) for r in d['relatedWords']))
+        self.assertEqual(self.search(Term(relation_type, target)), expected)
+        self.assertTrue(expected <= self.search(Term('related', target)))
+        self.assertIn(relation_type, self.lexicon.terms('relation'))
+
+    def test_entries_are_stored(self):
+        self.assertEqual(len(self.lexicon), len(self.results))
+        self.assertNotIn('missing', self.lexicon)
+        self.assertIn(('house', 'swedish'), self.lexicon)
+        self.assertEqual(self.lexicon.get('house'), self.results['house', 'english'])
+        self.assertEqual(self.lexicon.get('house', 'swedish'), self.results['house', 'swedish'])
+        match = self.lexicon.search(Term('word', 'song'))[0]
+        self.assertEqual(self.lexicon.definition(match),
+                         self.results['song', 'english'][match.entry]['definitions'][match.definition])
+
+        reopened = Lexicon(self.lexicon.path)
+        self.assertEqual(self.search(Term('word', 'song')),
+                         {(m.word, m.language, m.entry, m.definition) for m in reopened.search(Term('word', 'song'))})
+        reopened.add('song', self.results['test', 'english'])
+        self.assertEqual(reopened.get('song'), self.results['test', 'english'])
+        reopened.delete('song')
+        self.assertEqual(reopened.search(Term('word', 'song')), [])
+
+    def test_results_by_language(self):
+        lexicon = Lexicon(os.path.join(self.tmp_dir.name, 'languages.sqlite'))
+        lexicon.update([('house', {'english': self.results['house', 'english'],
+                                   'swedish': self.results['house', 'swedish']}),
+                        ('song', self.results['song', 'english'])])
+        self.assertEqual(len(lexicon), 3)
+        self.assertEqual(lexicon.get('house', 'swedish'), self.results['house', 'swedish'])
+        self.assertEqual({match.language for match in lexicon.search(Term('word', 'house'))}, {'english', 'swedish'})
+        lexicon.add('test', {'english': self.results['test', 'english']}, language='swedish')
+        self.assertIn(('test', 'english'), lexicon)
+        self.assertNotIn(('test', 'swedish'), lexicon)
+
+    def test_queries_are_abstract(self):
+        with self.assertRaises(TypeError):
+            Query()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import threading
+import time
+import asyncio
+import requests
+import mock
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from wiktionaryparser import WiktionaryParser, AsyncWiktionaryParser, RateLimiter
+
+
+PAGE = (
+    '<h2><span class="mw-headline" id="English">English</span></h2>'
+    '<h3><span class="mw-headline" id="Noun">Noun</span></h3><p>word</p><ol><li>a unit of language</li></ol>'
+    '<h4><span class="mw-headline" id="Translations">Translations</span></h4>'
+    '<div class="NavFrame"><div class="NavHead">See <a href="/wiki/word/translations#Noun">word/translations</a>'
+    '</div></div>'
+)
+TRANSLATIONS_SUBPAGE = (
+    '<h3><span class="mw-headline" id="Noun">Noun</span></h3>'
+    '<div class="NavFrame"><div class="NavHead">unit of language</div><div class="NavContent">'
+    '<table class="translations"><tbody><tr><td class="translations-cell"><ul>'
+    '<li>French: <span lang="fr"><a href="/wiki/mot#French">mot</a></span></li>'
+    '</ul></td></tr></tbody></table></div></div>'
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Throttles the first `throttled` requests (HTTP 429 + Retry-After), then serves the page
+    of the path from `pages`, or a tiny page."""
+    throttled = 0
+    requests_count = 0
+    pages = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            StubHandler.requests_count += 1
+            throttle = StubHandler.requests_count <= StubHandler.throttled
+        if throttle:
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.end_headers()
+        else:
+            body = self.pages.get(self.path.split('?')[0], '<html><body>ok</body></html>').encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRateLimiter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.url = 'http://127.0.0.1:{}/wiki/{{}}?printable=yes'.format(cls.server.server_port)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.throttled = 0
+        StubHandler.requests_count = 0
+        StubHandler.pages = {}
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        session = requests.Session()
+        start = time.monotonic()
+        for _ in range(5):
+            self.assertEqual(limiter.get(session, self.url.format('test')).status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_retry_after(self):
+        StubHandler.throttled = 1
+        parser = WiktionaryParser(rate_limiter=RateLimiter(max_retries=3))
+        parser.url = self.url
+        start = time.monotonic()
+        self.assertIn('ok', parser._download('test'))
+        self.assertGreaterEqual(time.monotonic() - start, 0.99)
+        self.assertEqual(StubHandler.requests_count, 2)
+
+    def test_gives_up_after_max_retries(self):
+        StubHandler.throttled = 10
+        limiter = RateLimiter(max_retries=1, backoff=0.01)
+        response = limiter.get(requests.Session(), self.url.format('test'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(StubHandler.requests_count, 2)
+
+    def test_max_per_host(self):
+        limiter = RateLimiter(max_per_host=2)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def request():
+            with limiter.host_slot('host'):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak[0], 2)
+
+    def test_parse_processes_send_no_request(self):
+        # Parse workers are given the subpages of translations, so that every request goes through the limiter
+        StubHandler.pages = {'/wiki/word': PAGE, '/wiki/word/translations': TRANSLATIONS_SUBPAGE}
+        limiter = RateLimiter(rate=100)
+        parser = WiktionaryParser(rate_limiter=limiter)
+        parser.url = self.url
+        with mock.patch.object(limiter, 'get', wraps=limiter.get) as limited_get:
+            results = dict(parser.fetch_many(['word'], return_word_class=False, parse_processes=2))
+        translations = results['word'][0]['definitions'][0]['translations']
+        self.assertEqual([sense['translations'] for sense in translations], [{'french': ' mot'}])
+        self.assertEqual([call[0][1] for call in limited_get.call_args_list],
+                         [self.url.format('word'), self.url.format('word/translations')])
+        self.assertEqual(StubHandler.requests_count, 2)
+
+    def test_async_subpages_are_downloaded_asynchronously(self):
+        async def fetch(async_parser):
+            async with async_parser:
+                return await async_parser.fetch('word', return_word_class=False)
+
+        StubHandler.pages = {'/wiki/word': PAGE, '/wiki/word/translations': TRANSLATIONS_SUBPAGE}
+        async_parser = AsyncWiktionaryParser()
+        async_parser.url = self.url
+        with mock.patch("requests.Session.get") as blocking_get:
+            result = asyncio.get_event_loop().run_until_complete(fetch(async_parser))
+        blocking_get.assert_not_called()
+        translations = result[0]['definitions'][0]['translations']
+        self.assertEqual([sense['translations'] for sense in translations], [{'french': ' mot'}])
+        self.assertEqual(StubHandler.requests_count, 2)
+
+    def test_async_retry_after(self):
+        async def download(async_parser):
+            async with async_parser:
+                return await async_parser._download_async('test')
+
+        StubHandler.throttled = 1
+        async_parser = AsyncWiktionaryParser(rate_limiter=RateLimiter(max_retries=3))
+        async_parser.url = self.url
+        self.assertIn('ok', asyncio.get_event_loop().run_until_complete(download(async_parser)))
+        self.assertEqual(StubHandler.requests_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
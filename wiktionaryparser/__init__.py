@@ -1,5 +1,12 @@
 from wiktionaryparser.utils import WordData, Word, Definition, RelatedWord
-from wiktionaryparser.core import PARTS_OF_SPEECH, RELATIONS, WiktionaryParser
+from wiktionaryparser.dicts import PARTS_OF_SPEECH, RELATIONS
+from wiktionaryparser.core import WiktionaryParser, parse_html
+from wiktionaryparser.aio import AsyncWiktionaryParser
+from wiktionaryparser.cache import DiskCache, ResultCache
+from wiktionaryparser.dumps import iter_html_dump, parse_dump
+from wiktionaryparser.lazy import LazyResult
+from wiktionaryparser.lexicon import Lexicon, Term
+from wiktionaryparser.throttle import RateLimiter
 from wiktionaryparser.definitions import PATH_LOG
 
 __all__ = [
@@ -10,5 +17,15 @@ __all__ = [
     'PARTS_OF_SPEECH',
     'RELATIONS',
     'WiktionaryParser',
+    'parse_html',
+    'AsyncWiktionaryParser',
+    'DiskCache',
+    'ResultCache',
+    'iter_html_dump',
+    'parse_dump',
+    'LazyResult',
+    'Lexicon',
+    'Term',
+    'RateLimiter',
     'PATH_LOG',
 ]
@@ -1,4 +1,17 @@
-class EmptyWordContents(Exception)
+class EmptyWordContents(Exception):
+    pass
+
+
+class APIError(Exception):
+    def __init__(self, error=None):
+        if error is None:
+            error = {}
+        self.error = error
+        super().__init__('{}: {}'.format(error.get('code'), error.get('info')))
+
+    def __reduce__(self):
+        return type(self), (self.error,)
+
 
 class TranslationParsingError(Exception):
     reason = "unknown"
@@ -16,6 +29,12 @@ class TranslationParsingError(Exception):
 
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # So that it can be sent back from parse processes. The tag of the html is left out,
+        # since it drags the whole tree along
+        info = {key: value for key, value in self.info.items() if key != 'html'}
+        return type(self), (info, self.show_html)
+
     @property
     def message(self):
         msg = ''
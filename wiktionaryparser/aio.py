@@ -0,0 +1,198 @@
+import asyncio
+from collections import OrderedDict
+from functools import partial
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from wiktionaryparser.core import WiktionaryParser, _parse_api_params, _api_result, _section_toc, _check_sections, \
+    _subpage_titles
+from wiktionaryparser.cache import canonical_title
+from wiktionaryparser.logger import logger
+from wiktionaryparser.utils import Word
+
+
+class AsyncWiktionaryParser(WiktionaryParser):
+    """asyncio flavour of WiktionaryParser.
+
+    Pages are downloaded with a shared aiohttp connection pool, with at most
+    `max_concurrency` requests in flight. Parsing (which is CPU-bound) runs on
+    `executor` (the loop's default executor if None), so that the event loop
+    is never blocked by a large page.
+    If a `rate_limiter` is given, its rate and retry policy apply as well
+    (`max_concurrency` plays the role of its per-host limit).
+    Other keyword arguments (cache, result_cache, rate_limiter, fetch_mode, features...) are those of
+    WiktionaryParser.
+    Requires aiohttp.
+    """
+
+    def __init__(self, language="english", max_concurrency=8, executor=None, max_retries=2, **kwargs):
+        if aiohttp is None:
+            raise ImportError("AsyncWiktionaryParser requires aiohttp. Install it with `pip install aiohttp`")
+        super().__init__(language=language, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.executor = executor
+        self.async_session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.async_session is not None:
+            await self.async_session.close()
+        self.async_session = None
+        self._semaphore = None
+
+    def _ensure_session(self):
+        # Both have to be created from within the running event loop
+        if self.async_session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.async_session = aiohttp.ClientSession(connector=connector)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _get_async(self, url, params=None):
+        """Sends a GET request, retrying it after connection errors (and throttling, if there is a rate limiter).
+        Returns the status and the text of the response."""
+        self._ensure_session()
+        attempt = throttled = 0
+        async with self._semaphore:
+            while True:
+                if self.rate_limiter is not None:
+                    await asyncio.sleep(self.rate_limiter.reserve())
+                try:
+                    async with self.async_session.get(url, params=params) as response:
+                        if self.rate_limiter is None or not self.rate_limiter.should_retry(response.status, throttled):
+                            return response.status, await response.text()
+                        delay = self.rate_limiter.retry_delay(throttled, response.headers.get('Retry-After'))
+                except aiohttp.ClientConnectionError as e:
+                    if attempt == self.max_retries:
+                        raise e
+                    attempt += 1
+                    logger.debug('Retrying URL:"{}" after: {}'.format(url, e))
+                    continue
+                logger.debug('HTTP {} for URL:"{}". Retrying in {:.2f}s'.format(response.status, url, delay))
+                throttled += 1
+                await asyncio.sleep(delay)
+
+    async def _download_async(self, word, old_id=None, fetch_mode=None):
+        if fetch_mode is None:
+            fetch_mode = self.fetch_mode
+        variant = 'section:' + self.language if fetch_mode == 'section' else ''
+        if self.cache is not None:
+            html = self.cache.get(word, old_id, variant=variant)
+            if html is not None:
+                return html
+        if fetch_mode == 'section':
+            params = {key: str(value) for key, value in _parse_api_params(word, old_id).items()}
+            _, text = await self._get_async(self.api_url, dict(params, prop='sections'))
+            index, toc = _section_toc(_api_result(text)['sections'], self.language)
+            status, text = await self._get_async(
+                self.api_url, dict(params, prop='text', section=index, disableeditsection='1'))
+            html = toc + _api_result(text)['text']
+        else:
+            params = {'oldid': str(old_id)} if old_id is not None else None
+            status, html = await self._get_async(self.url.format(word), params)
+        if self.cache is not None and status == 200:
+            self.cache.set(word, old_id, html, variant=variant)
+        return html
+
+    async def _download_subpages_async(self, html, sections=None):
+        """Downloads the subpages of translations that `html` links to, if translations are to be parsed.
+        Returns {subpage title: html}."""
+        if 'translations' not in _check_sections(sections):
+            return {}
+        titles = _subpage_titles(html)
+        pages = await asyncio.gather(*[self._download_async(title, fetch_mode='page') for title in titles])
+        return dict(zip(map(canonical_title, titles), pages))
+
+    async def _parse_async(self, html, word, languages=None, sections=None, **kwargs):
+        """Runs `parse` (or `parse_languages`, if `languages` is given) on the executor.
+        The subpages of translations are downloaded beforehand, so that parsing sends no (blocking) request."""
+        parser = self._spawn()
+        parser._prefetched = await self._download_subpages_async(html, sections)
+        if languages is None:
+            parse = partial(parser.parse, html, word, sections=sections, **kwargs)
+        else:
+            parse = partial(parser.parse_languages, html, word, languages, sections=sections, **kwargs)
+        return await asyncio.get_event_loop().run_in_executor(self.executor, parse)
+
+    async def fetch(self, word, old_id=None, return_word_class=True, languages=None, lazy=False, sections=None,
+                    as_records=False):
+        """Coroutine counterpart of WiktionaryParser.fetch, with the same arguments and results."""
+        sections = _check_sections(sections)
+        if languages is not None:
+            return await self._fetch_languages_async(word, old_id, languages, return_word_class, lazy, sections,
+                                                     as_records)
+        if lazy or as_records:
+            html = await self._download_async(word, old_id)
+            return await self._parse_async(html, word, lazy=lazy, sections=sections, as_records=as_records)
+        word_data = None
+        if self.result_cache is not None:
+            key = self._result_key(word, old_id, sections=sections)
+            word_data = self.result_cache.get(key)
+        if word_data is None:
+            html = await self._download_async(word, old_id)
+            word_data = await self._parse_async(html, word, return_word_class=False, sections=sections)
+            if self.result_cache is not None:
+                word_data = self.result_cache.set(key, word_data)
+        if not return_word_class:
+            return word_data
+        else:
+            return Word(word_data, word)
+
+    async def _fetch_languages_async(self, word, old_id, languages, return_word_class, lazy=False, sections=None,
+                                     as_records=False):
+        # The whole page is needed, whatever the fetch mode
+        if lazy or as_records:
+            html = await self._download_async(word, old_id, fetch_mode='page')
+            return await self._parse_async(html, word, languages, lazy=lazy, sections=sections, as_records=as_records)
+        results, missing = self._cached_languages(word, old_id, languages, sections)
+        if missing:
+            html = await self._download_async(word, old_id, fetch_mode='page')
+            parsed = await self._parse_async(html, word, missing, return_word_class=False, sections=sections)
+            self._cache_languages(word, old_id, results, missing, parsed, sections)
+        if not return_word_class:
+            return results
+        else:
+            return OrderedDict((language, Word(word_data, word)) for language, word_data in results.items())
+
+    async def fetch_many(self, words, return_word_class=True, sections=None):
+        """Asynchronous generator counterpart of WiktionaryParser.fetch_many.
+        Yields (word, result) pairs as soon as each page is done. Items of `words`
+        can be either words or (word, old_id) tuples. If fetching or parsing a word fails,
+        the exception is yielded in place of the result.
+        """
+        async def fetch_one(word, old_id):
+            try:
+                return word, await self.fetch(word, old_id, return_word_class, sections=sections)
+            except Exception as e:
+                logger.warning('Could not fetch WORD:"{}": {}'.format(word, e))
+                return word, e
+
+        items = iter(words)
+        pending = set()
+        try:
+            while True:
+                # Keep a bounded number of tasks alive, so that long word lists are consumed lazily
+                for item in items:
+                    word, old_id = item if isinstance(item, tuple) else (item, None)
+                    pending.add(asyncio.ensure_future(fetch_one(word, old_id)))
+                    if len(pending) >= 2 * self.max_concurrency:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller may stop early: the words still in flight are not needed anymore
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,243 @@
+import os, json, time, zlib, sqlite3, threading, unicodedata
+from collections import OrderedDict
+from urllib.parse import unquote
+
+from wiktionaryparser.logger import logger
+
+
+def canonical_title(title):
+    """Canonical form of a page title, so that e.g. 'ice_cream', 'ice%20cream'
+    and 'ice cream#English' all refer to the same page."""
+    title = unquote(title).split('#')[0]
+    title = unicodedata.normalize('NFC', title)
+    return ' '.join(title.replace('_', ' ').split())
+
+
+class _SQLiteStore(object):
+    """Base of the stores kept in a SQLite database at `path`, which can be shared between threads
+    and processes, and pickled (e.g. to be sent to parse processes)."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+        dirname = os.path.dirname(self.path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+    def __getstate__(self):
+        # Connections cannot be pickled
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=60)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+
+class DiskCache(_SQLiteStore):
+    """Persistent cache of raw page HTML, keyed by (title, old_id).
+    An additional `variant` key tells apart different downloads of a same page (e.g. a single section).
+
+    Pages are stored zlib-compressed in a SQLite database, which makes the cache
+    safe to share between threads and processes.
+    - `max_size`: maximum total size (in bytes, compressed) of the stored pages.
+        Least recently used pages are evicted first. None means unbounded.
+    - `ttl`: time to live (in seconds) of pages fetched without an old_id, i.e. whose
+        content may change over time. Pages of a specific revision never expire.
+        None means they do not expire either.
+    """
+
+    def __init__(self, path, max_size=None, ttl=None):
+        super().__init__(path)
+        self.max_size = max_size
+        self.ttl = ttl
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "title TEXT NOT NULL, old_id TEXT NOT NULL, variant TEXT NOT NULL, content BLOB NOT NULL, "
+                "size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (title, old_id, variant))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+            # Running total of the sizes, kept up to date by triggers (in the transaction of every change),
+            # so that eviction does not sum the whole table
+            connection.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS pages_insert AFTER INSERT ON pages BEGIN "
+                "UPDATE metadata SET value = value + NEW.size WHERE key = 'total_size'; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS pages_delete AFTER DELETE ON pages BEGIN "
+                "UPDATE metadata SET value = value - OLD.size WHERE key = 'total_size'; END"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO metadata VALUES ('total_size', (SELECT COALESCE(SUM(size), 0) FROM pages))"
+            )
+
+    @classmethod
+    def _key(cls, title, old_id, variant=''):
+        return canonical_title(title), '' if old_id is None else str(old_id), variant
+
+    def get(self, title, old_id=None, variant=''):
+        """Returns the cached HTML of the page, or None if it is not cached (or it expired)."""
+        key = self._key(title, old_id, variant)
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT content, fetched_at FROM pages WHERE title = ? AND old_id = ? AND variant = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            content, fetched_at = row
+            if not key[1] and self.ttl is not None and now - fetched_at > self.ttl:
+                connection.execute("DELETE FROM pages WHERE title = ? AND old_id = ? AND variant = ?", key)
+                return None
+            connection.execute(
+                "UPDATE pages SET accessed_at = ? WHERE title = ? AND old_id = ? AND variant = ?", (now,) + key
+            )
+        return zlib.decompress(content).decode('utf-8')
+
+    def set(self, title, old_id, html, variant=''):
+        key = self._key(title, old_id, variant)
+        content = zlib.compress(html.encode('utf-8'))
+        now = time.time()
+        with self._connection() as connection:
+            # Not INSERT OR REPLACE, whose implicit deletes do not fire the triggers
+            connection.execute("DELETE FROM pages WHERE title = ? AND old_id = ? AND variant = ?", key)
+            connection.execute(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                key + (content, len(content), now, now)
+            )
+            if self.max_size is not None:
+                self._evict(connection)
+
+    def _evict(self, connection):
+        total_size, = connection.execute("SELECT value FROM metadata WHERE key = 'total_size'").fetchone()
+        if total_size <= self.max_size:
+            return
+        rows = connection.execute("SELECT title, old_id, variant, size FROM pages ORDER BY accessed_at")
+        to_delete = []
+        for title, old_id, variant, size in rows:
+            if total_size <= self.max_size:
+                break
+            to_delete.append((title, old_id, variant))
+            total_size -= size
+        logger.debug("Evicting {} pages from cache".format(len(to_delete)))
+        connection.executemany("DELETE FROM pages WHERE title = ? AND old_id = ? AND variant = ?", to_delete)
+
+    def delete(self, title, old_id=None, variant=''):
+        key = self._key(title, old_id, variant)
+        with self._connection() as connection:
+            connection.execute("DELETE FROM pages WHERE title = ? AND old_id = ? AND variant = ?", key)
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM pages")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def __contains__(self, key):
+        key = self._key(*key) if isinstance(key, tuple) else self._key(key, None)
+        row = self._connection().execute(
+            "SELECT 1 FROM pages WHERE title = ? AND old_id = ? AND variant = ?", key
+        ).fetchone()
+        return row is not None
+
+
+class FrozenDict(dict):
+    """Read-only dict, so that cached results cannot be modified by callers."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached results are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(obj):
+    """Returns a read-only deep copy of a json-like object (dicts and lists become FrozenDicts and tuples)."""
+    if isinstance(obj, dict):
+        return FrozenDict((key, freeze(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+
+class ResultCache(object):
+    """Bounded in-memory LRU cache of parse results, shared by threads.
+
+    Results are stored frozen (see `freeze`), so that the entries cannot be corrupted by callers.
+    - `max_entries`: maximum number of stored results.
+    - `max_bytes`: maximum total size of the stored results, as measured by the length of their json
+        (only measured when it is set).
+    If both are None, at most DEFAULT_MAX_ENTRIES results are kept.
+    """
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        if max_entries is None and max_bytes is None:
+            max_entries = self.DEFAULT_MAX_ENTRIES
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached result, or None if there is none."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        """Stores the result and returns its frozen version."""
+        value = freeze(value)
+        size = 0
+        if self.max_bytes is not None:
+            size = len(json.dumps(value, ensure_ascii=False))
+            if size > self.max_bytes:
+                return value
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while (self.max_entries is not None and len(self._entries) > self.max_entries) or \
+                    (self.max_bytes is not None and self.size > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, entries=len(self), size=self.size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
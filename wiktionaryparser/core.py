@@ -1,15 +1,38 @@
-import re, requests
+import re, json, requests
+from html import escape as html_escape, unescape as html_unescape
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from itertools import zip_longest
+from bs4.element import Tag, NavigableString, CData
 from copy import copy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import ExitStack
 from string import digits
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 from wiktionaryparser.utils import WordData, Definition, RelatedWord, TranslationSense, Word, default_debugger
 from wiktionaryparser.logger import logger
+from wiktionaryparser.cache import canonical_title
+from wiktionaryparser.layout import SectionLayout
+from wiktionaryparser.lazy import LazyResult, SECTIONS, _PARSE_METHODS
 from wiktionaryparser.terminology import TERMINOLOGY_PARTS_OF_SPEECH, TERMINOLOGY_RELATIONS, TERMINOLOGY_ADDITIONAL
 from wiktionaryparser._exceptions import *
 
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+# Headings of sections (h1 is the title of the page)
+SECTION_HEADING_TAGS = HEADING_TAGS[1:]
+CONTENT_TYPES = ['etymologies', 'pronunciation', 'definitions', 'related', 'translations']
+
+ContentEntry = namedtuple('ContentEntry', ['path', 'index', 'id', 'title', 'content_type'])
+
+_DIGITS_TABLE = str.maketrans('', '', digits)
+# Links to subpages of translations, e.g. href="/wiki/word/translations#Noun"
+# Links of printable pages are '/wiki/word/translations#Noun', those of Parsoid HTML './word/translations#Noun'
+_SUBPAGE_LINK_RE = re.compile(r'href="(?:/wiki/|\./)([^"#]+/translations)#')
+# Classes of the tags removed before parsing
+_UNWANTED_CLASSES = frozenset(['sister-wikipedia', 'thumb', 'reference', 'cited-source'])
+# String types that make up the text of a tag (i.e. not comments, scripts...)
+_TEXT_TYPES = (NavigableString, CData)
+
 # TODO split file for translations parsing
 # TODO implement see also
 # TODO change to language-specific via inheritance
@@ -22,18 +45,36 @@ class WiktionaryParser(object):
     _RELATIONS = set(TERMINOLOGY_RELATIONS)
     _ADDITIONAL_ITEMS = set(TERMINOLOGY_ADDITIONAL)
 
-    def __init__(self, language="english"):
+    FETCH_MODES = ['page', 'section']
+
+    def __init__(self, language="english", cache=None, result_cache=None, rate_limiter=None, fetch_mode='page',
+                 features='html.parser', slice_language=False, translation_languages=None):
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError("Invalid fetch_mode: {}. Choose one of: {}".format(fetch_mode, self.FETCH_MODES))
         self.word_contents = None
         self.ids = None
         self.current_word = None
         self.soup = None
+        self.anchors = None
+        self.headings = None
         self._included_parts_of_speech = set()
         self._included_relations = set()
+        self._subpages = {}
+        self._prefetched = {}
         self.url = "https://en.wiktionary.org/wiki/{}?printable=yes"
+        self.api_url = "https://en.wiktionary.org/w/api.php"
+        self.fetch_mode = fetch_mode
+        self.features = features
+        self.slice_language = slice_language
+        self.translation_languages = None
+        if translation_languages is not None:
+            self.translation_languages = {language.lower() for language in translation_languages}
         self.session = requests.Session()
-        self.session.mount("http://", requests.adapters.HTTPAdapter(max_retries=2))
-        self.session.mount("https://", requests.adapters.HTTPAdapter(max_retries=2))
+        _mount_adapters(self.session, respect_retry_after=rate_limiter is None)
         self.language = language
+        self.cache = cache
+        self.result_cache = result_cache
+        self.rate_limiter = rate_limiter
         self.DEBUG = default_debugger()
 
     def clear(self):
@@ -41,6 +82,10 @@ class WiktionaryParser(object):
         self.ids = None
         self.current_word = None
         self.soup = None
+        self.anchors = None
+        self.headings = None
+        self._subpages = {}
+        self._prefetched = {}
         self.DEBUG = default_debugger()
 
     @property
@@ -69,93 +114,159 @@ class WiktionaryParser(object):
         self._included_relations.remove(relation.lower())
 
     def clean_html(self):
-        unwanted_classes = ['sister-wikipedia', 'thumb', 'reference', 'cited-source']
-        for tag in self.soup.find_all(True, {'class': unwanted_classes}):
+        for tag in _find_tags(self.soup, _is_unwanted):
             tag.extract()
+        _flatten_sections(self.soup)
+
+    def index_document(self):
+        """Walks the document once, and indexes:
+        - anchors: {id: tag} (the first tag with each id), from which every section is located,
+        - headings: [(level, id, tag), ...] in document order (the section hierarchy).
+        The tag of a heading is either its span.mw-headline (printable pages), or the h2-h6 tag
+        itself, which carries the id in current skins. Headings without id only close the sections before them.
+        """
+        self.anchors, self.headings = _index_anchors(self.soup)
 
     @classmethod
     def remove_digits(cls, string):
-        return string.translate(str.maketrans('', '', digits)).strip()
+        return string.translate(_DIGITS_TABLE).strip()
 
     @classmethod
     def count_digits(cls, string):
         return len(list(filter(str.isdigit, string)))
 
-    def set_ids(self):
-        checklist_by_type = {
-            'etymologies': ['etymology'],
-            'pronunciation': ['pronunciation'],
-            'definitions': self.PARTS_OF_SPEECH,
-            'related': self.RELATIONS,
-            'translations': ['translations'],
-        }
+    def _content_types(self):
+        """Returns {section title (lowercase, without digits): content type}."""
+        content_types = {'etymology': 'etymologies', 'pronunciation': 'pronunciation', 'translations': 'translations'}
+        for part_of_speech in self.PARTS_OF_SPEECH | self._included_parts_of_speech:
+            content_types[part_of_speech] = 'definitions'
+        for relation in self.RELATIONS | self._included_relations:
+            content_types[relation] = 'related'
         if self.language == 'chinese':
-            checklist_by_type['definitions'] += self.current_word
-
-        ids = {}
-        word_contents = self.word_contents
-
-        for content_type, checklist in checklist_by_type.items():
-            if len(word_contents) == 0:
-                ids = [('1', x.title(), x) for x in checklist if self.soup.find('span', {'id': x.title()})]
+            content_types[self.current_word] = 'definitions'
+        return content_types
+
+    def walk_headings(self, content_types=None):
+        """Builds the same word contents as the table of contents would, in a single walk
+        of the headings (see index_document): the section of the parser's language is the (last)
+        h2 with its name, and its subsections are numbered after the h3-h6 hierarchy that follows it."""
+        if content_types is None:
+            content_types = self._content_types()
+        word_contents = []
+        numbers = levels = None
+        top_number = 0
+        language_found = False
+        for level, heading_id, heading_tag in self.headings:
+            if level <= 2:
+                top_number += 1
+                if heading_tag.text.lower() == self.language:
+                    language_found = True
+                    numbers, levels = [top_number], [level]
+                    word_contents = []
+                else:
+                    numbers = levels = None
+                continue
+            if numbers is None:
+                continue
+            while len(levels) > 1 and levels[-1] > level:
+                levels.pop()
+                numbers.pop()
+            if levels[-1] == level:
+                numbers[-1] += 1
             else:
-                ids_current_type = []
-                for content_tag in word_contents:
-                    content_index = content_tag.find_previous().text
-                    text_to_check = self.remove_digits(content_tag.text).strip().lower()
-                    if text_to_check in checklist:
-                        content_id = content_tag.parent['href'].replace('#', '')
-                        ids_current_type.append((content_index, content_id, text_to_check))
-            ids[content_type] = ids_current_type
-        self.ids = ids
-
-
-    def set_word_contents(self):
-        contents = self.soup.find_all('span', {'class': 'toctext'})
+                levels.append(level)
+                numbers.append(1)
+            title = self.remove_digits(heading_tag.text.lower())
+            content_type = content_types.get(title)
+            if content_type is not None and heading_id is not None:
+                path = tuple(numbers)
+                word_contents.append(ContentEntry(path, '.'.join(map(str, path)), heading_id, title, content_type))
+        if not language_found:
+            logger.error("Language not found in headings: {}".format(self.language))
+            raise EmptyWordContents()
+        return word_contents
+
+    def classify_contents(self):
+        """Classifies, in a single pass over the table of contents, the sections of the parser's language
+        into etymologies, pronunciation, definitions (parts of speech), related (relations) and translations.
+        Sets:
+        - word_contents: [ContentEntry(path, index, id, title, content_type), ...] in document order,
+            where `path` is the numeric index of the section, e.g. (3, 2, 1) for index '3.2.1',
+        - ids: {content_type: [(index, id, title), ...]}, which the parse_* methods work on.
+        """
+        content_types = self._content_types()
         word_contents = []
+        toc_found = False
         start_index = None
-        for content in contents:
-            if content.text.lower() == self.language:
-                start_index = content.find_previous().text + '.'
-        if len(contents) > 0 and start_index is None:
-            logger.debug(contents)
+        for toc_tag in self.soup.find_all('span', {'class': 'toctext'}):
+            toc_found = True
+            index = toc_tag.find_previous().text
+            text = toc_tag.text
+            if text.lower() == self.language:
+                # If the language appears more than once, the last one is kept
+                start_index = index + '.'
+                word_contents = []
+                continue
+            if start_index is None or not index.startswith(start_index):
+                continue
+            title = self.remove_digits(text.lower())
+            content_type = content_types.get(title)
+            if content_type is not None:
+                content_id = toc_tag.parent['href'].replace('#', '')
+                path = tuple(int(number) for number in index.split('.'))
+                word_contents.append(ContentEntry(path, index, content_id, title, content_type))
+
+        if not toc_found:
+            # Current skins often omit the table of contents: rely on the headings instead
+            word_contents = self.walk_headings(content_types)
+        elif start_index is None:
             logger.error("Empty table of contents")
             raise EmptyWordContents()
-        else:
-            for content in contents:
-                index = content.find_previous().text
-                content_text = self.remove_digits(content.text.lower())
-                if index.startswith(start_index) and content_text in self.INCLUDED_ITEMS:
-                    word_contents.append(content)
-            self.word_contents = word_contents
-            self.DEBUG['word_contents'] = word_contents
-            logger.debug("Exit")
-
-    def get_word_data(self):
-        word_data = {
-            'examples': self.parse_examples(),
-            'definitions': self.parse_definitions(),
-            'etymologies': self.parse_etymologies(),
-            'related': self.parse_related_words(),
-            'pronunciations': self.parse_pronunciations(),
-            'translations': self.parse_translations(),
-        }
+
+        ids = {content_type: [] for content_type in CONTENT_TYPES}
+        for entry in word_contents:
+            ids[entry.content_type].append((entry.index, entry.id, entry.title))
+        self.word_contents = word_contents
+        self.ids = ids
+        logger.debug("Exit")
+
+    def get_word_data(self, sections=None, as_records=False):
+        """Runs the parse_* method of each section (see SECTIONS), and assembles the results.
+        If `sections` is given, the other sections are not parsed at all, and come out empty.
+        If `as_records`, the entries are returned as WordData records instead of json."""
+        sections = _check_sections(sections)
+        word_data = {}
+        for section in SECTIONS:
+            if section in sections:
+                word_data[section] = getattr(self, _PARSE_METHODS[section])()
+            else:
+                word_data[section] = self.empty_section(section)
         self.DEBUG['word_data0'] = word_data
-        json_obj_list = self.map_to_object(word_data)
+        json_obj_list = self.map_to_object(word_data, as_json=not as_records)
         self.DEBUG['get_word_data'] = json_obj_list
         self.DEBUG['word_data'] = json_obj_list
         logger.debug("Exit")
         return json_obj_list
 
+    def empty_section(self, section):
+        """Returns the result of a section left out: empty, but etymologies and definitions still shape the entries."""
+        if section == 'etymologies':
+            return [(index, '') for index, _, _ in self.ids['etymologies']]
+        if section == 'definitions':
+            return [(index, [], '' if title == 'definitions' else title) for index, _, title in self.ids['definitions']]
+        return []
+
     def parse_pronunciations(self):
         pronunciation_id_list = self.ids.get('pronunciation')
         pronunciation_list = []
         audio_links = []
         pronunciation_div_classes = ['mw-collapsible', 'vsSwitcher']
+        # Superscripts, audio players and nested lists are left out of the text of each item
+        skip_in_text = lambda tag: tag.name in ['sup', 'ul'] or _has_class(tag, 'mediaContainer')
+        skip_in_audio = lambda tag: tag.name == 'sup'
         for pronunciation_index, pronunciation_id, _ in pronunciation_id_list:
             pronunciation_text = []
-            span_tag = self.soup.find_all('span', {'id': pronunciation_id})[0]
-            list_tag = span_tag.parent
+            list_tag = _heading_tag(self.anchors[pronunciation_id])
             while list_tag.name != 'ul':
                 list_tag = list_tag.find_next_sibling()
                 if list_tag.name == 'p':
@@ -163,16 +274,19 @@ class WiktionaryParser(object):
                     break
                 if list_tag.name == 'div' and any(_ in pronunciation_div_classes for _ in list_tag['class']):
                     break
-            for super_tag in list_tag.find_all('sup'):
-                super_tag.clear()
+            # An audio player belongs to the outermost item it is in
+            seen_audio_tags = set()
             for list_element in list_tag.find_all('li'):
-                for audio_tag in list_element.find_all('div', {'class': 'mediaContainer'}):
-                    audio_links.append(audio_tag.find('source')['src'])
-                    audio_tag.extract()
-                for nested_list_element in list_element.find_all('ul'):
-                    nested_list_element.extract()
-                if list_element.text and not list_element.find('table', {'class': 'audiotable'}):
-                    pronunciation_text.append(list_element.text.strip())
+                for audio_tag in _iter_tree(list_element, skip_in_audio):
+                    if isinstance(audio_tag, Tag) and audio_tag.name == 'div' and \
+                            _has_class(audio_tag, 'mediaContainer') and id(audio_tag) not in seen_audio_tags:
+                        seen_audio_tags.add(id(audio_tag))
+                        audio_links.append(audio_tag.find('source')['src'])
+                list_element_text = _text(list_element, skip_in_text)
+                has_audio_table = any(isinstance(tag, Tag) and tag.name == 'table' and _has_class(tag, 'audiotable')
+                                      for tag in _iter_tree(list_element, skip_in_text))
+                if list_element_text and not has_audio_table:
+                    pronunciation_text.append(list_element_text.strip())
             pronunciation_list.append((pronunciation_index, pronunciation_text, audio_links))
         return pronunciation_list
 
@@ -180,10 +294,11 @@ class WiktionaryParser(object):
         definition_id_list = self.ids.get('definitions')
         definition_list = []
         definition_tag = None
+        # Examples (and quotations) are left out of the numbered definitions
+        skip_examples = lambda tag: tag.name in ['dd', 'ul', 'ol']
         for def_index, def_id, def_type in definition_id_list:
             definition_text = []
-            span_tag = self.soup.find_all('span', {'id': def_id})[0]
-            table = span_tag.parent.find_next_sibling()
+            table = _heading_tag(self.anchors[def_id]).find_next_sibling()
             while table and table.name not in ['h3', 'h4', 'h5']:
                 definition_tag = table
                 table = table.find_next_sibling()
@@ -191,9 +306,11 @@ class WiktionaryParser(object):
                     if definition_tag.text.strip():
                         definition_text.append(definition_tag.text.strip())
                 if definition_tag.name in ['ol', 'ul']:
+                    skip = skip_examples if definition_tag.name == 'ol' else None
                     for element in definition_tag.find_all('li', recursive=False):
-                        if element.text:
-                            definition_text.append(element.text.strip())
+                        element_text = _text(element, skip)
+                        if element_text:
+                            definition_text.append(element_text.strip())
             if def_type == 'definitions':
                 def_type = ''
             definition_list.append((def_index, definition_text, def_type))
@@ -203,9 +320,9 @@ class WiktionaryParser(object):
         definition_id_list = self.ids.get('definitions')
         example_list = []
         for def_index, def_id, def_type in definition_id_list:
-            span_tag = self.soup.find_all('span', {'id': def_id})[0]
-            table = span_tag.parent
-            while table.name != 'ol':
+            table = _heading_tag(self.anchors[def_id])
+            # A single section (see fetch_mode) may end before any list is found
+            while table and table.name != 'ol':
                 table = table.find_next_sibling()
             examples = []
             while table and table.name == 'ol':
@@ -213,10 +330,7 @@ class WiktionaryParser(object):
                     example_text = re.sub(r'\([^)]*\)', '', element.text.strip())
                     if example_text:
                         examples.append(example_text)
-                    element.clear()
                 example_list.append((def_index, examples, def_type))
-                for quot_list in table.find_all(['ul', 'ol']):
-                    quot_list.clear()
                 table = table.find_next_sibling()
         return example_list
 
@@ -226,8 +340,7 @@ class WiktionaryParser(object):
         etymology_tag = None
         for etymology_index, etymology_id, _ in etymology_id_list:
             etymology_text = ''
-            span_tag = self.soup.find_all('span', {'id': etymology_id})[0]
-            next_tag = span_tag.parent.find_next_sibling()
+            next_tag = _heading_tag(self.anchors[etymology_id]).find_next_sibling()
             while next_tag and next_tag.name not in ['h3', 'h4', 'div', 'h5']:
                 etymology_tag = next_tag
                 next_tag = next_tag.find_next_sibling()
@@ -244,8 +357,7 @@ class WiktionaryParser(object):
         related_words_list = []
         for related_index, related_id, relation_type in relation_id_list:
             words = []
-            span_tag = self.soup.find_all('span', {'id': related_id})[0]
-            parent_tag = span_tag.parent
+            parent_tag = _heading_tag(self.anchors[related_id])
             while parent_tag and not parent_tag.find_all('li'):
                 parent_tag = parent_tag.find_next_sibling()
             if parent_tag:
@@ -273,21 +385,22 @@ class WiktionaryParser(object):
         info = dict(word=self.current_word)
         for translations_index, translations_id, _ in translations_id_list:
             cur_translation_list = []
-            span_tag = self.soup.find_all('span', {'id': translations_id})[0]
+            span_tag = self.anchors[translations_id]
             self.DEBUG['transl1'] = span_tag
             cur_transl_senses = _get_senses(span_tag, info=info)
             self.DEBUG['cur_transl_senses'] = cur_transl_senses
             self.DEBUG['last_transl_tag'] = cur_transl_senses[-1]
             # If translations are somewhere else, go look for them
             if len(cur_transl_senses) == 1 and '/translations' in cur_transl_senses[0][1].text:
-                span_tag = _second_lookup(self.url, cur_transl_senses)
+                span_tag = self._second_lookup(cur_transl_senses)
                 self.DEBUG['transl2'] = span_tag
                 cur_transl_senses = _get_senses(span_tag, info=info)
                 self.DEBUG['cur_transl_senses'] = cur_transl_senses
             for (sense, sense_tag) in cur_transl_senses:
                 info.update(sense=sense)
                 # TODO follow link if (1) there is an italic tag with "see" in it (example under word 'word')
-                cur_translation_list.append((sense, _extract_languages_safe(sense_tag, info=info)))
+                cur_translation_list.append((sense, _extract_languages_safe(sense_tag, info=info,
+                                                                            languages=self.translation_languages)))
                 self.DEBUG['extract_languages'] = cur_translation_list
             self.DEBUG['cur_transl_list'] = cur_translation_list
 
@@ -298,58 +411,30 @@ class WiktionaryParser(object):
         return translations_list
 
     @classmethod
-    def map_to_object(cls, word_data):
+    def map_to_object(cls, word_data, as_json=True):
+        """Assembles the results of the parse_* methods into a list of entries (one per etymology),
+        attaching every section to its owner in a single pass (see SectionLayout).
+        The entries are WordData records, converted to json unless `as_json` is False."""
         logger.debug("Enter")
+        layout = SectionLayout([index for index, _ in word_data['etymologies']],
+                               [index for index, _, _ in word_data['definitions']])
+        attached = {section: layout.attach(section, word_data[section]) for section in SECTIONS}
         json_obj_list = []
-        if not word_data['etymologies']:
-            word_data['etymologies'] = [('', '')]
-
-        # Loop over etymologies
-        for (current_etymology, next_etymology) in zip_longest(word_data['etymologies'], word_data['etymologies'][1:],
-                                                               fillvalue=('999', '')):
+        for etymology_position, definition_positions in enumerate(layout.entries):
             data_obj = WordData()
-            data_obj.etymology = current_etymology[1]
-
-            # Loop over pronunciations
-            # Check if:
-            #   1. Pronunciation is at the same level of etymology(ies)
-            #   2. Pronunciation index "is sorted" after current etymology index
-            #      and before next etymology index (string comparison)
-            for pronunciation_index, pronunciation_text, audio_links in word_data['pronunciations']:
-                if (cls.count_digits(current_etymology[0]) == cls.count_digits(pronunciation_index)) or (
-                        current_etymology[0] <= pronunciation_index < next_etymology[0]):
-                    data_obj.pronunciations = pronunciation_text
-                    data_obj.audio_links = audio_links
-
-            # Loop over definitions
-            # Check if definition index "sorts" after current etymology index
-            # and before next etymology index (string comparison)
-            # If so, loop over examples, related and translations, and for each one,
-            # pick the ones whose index starts like the definition index
-            for (current_definition, next_definition) in zip_longest(word_data['definitions'],
-                                                                     word_data['definitions'][1:],
-                                                                     fillvalue=('999', '', '')):
-                definition_index, definition_text, definition_type = current_definition
-                next_definition_index, _, _ = next_definition
-                if current_etymology[0] <= definition_index < next_etymology[0]:
-                    logger.debug('\n>> {} {}'.format(definition_index, definition_text))
-                    def_obj = Definition()
-                    def_obj.text = definition_text
-                    def_obj.part_of_speech = definition_type
-                    for example_index, examples, _ in word_data['examples']:
-                        if example_index.startswith(definition_index):
-                            def_obj.example_uses = examples
-                    for related_word_index, related_words, relation_type in word_data['related']:
-                        if related_word_index.startswith(definition_index):
-                            def_obj.related_words.append(RelatedWord(relation_type, related_words))
-                    found = False
-                    for translations_index, translations_list in word_data['translations']:
-                        if definition_index <= translations_index < next_definition_index:
-                            for sense, translations_dict in translations_list:
-                                def_obj.translations.append(TranslationSense(sense, translations_dict))
-                                logger.debug('COND 1: {} {}'.format(translations_index, definition_index))
-                    data_obj.definition_list.append(def_obj)
-            json_obj_list.append(data_obj.to_json())
+            data_obj.etymology = attached['etymologies'].get(etymology_position, '')
+            if etymology_position in attached['pronunciations']:
+                data_obj.pronunciations, data_obj.audio_links = attached['pronunciations'][etymology_position]
+            for position in definition_positions:
+                def_obj = Definition()
+                def_obj.text, def_obj.part_of_speech = attached['definitions'][position]
+                def_obj.example_uses = attached['examples'].get(position, [])
+                def_obj.related_words = [RelatedWord(relation_type, related_words) for relation_type, related_words
+                                         in attached['related'].get(position, [])]
+                def_obj.translations = [TranslationSense(sense, translations_dict) for sense, translations_dict
+                                        in attached['translations'].get(position, [])]
+                data_obj.definition_list.append(def_obj)
+            json_obj_list.append(data_obj.to_json() if as_json else data_obj)
 
         logger.debug("Exit")
 
@@ -357,18 +442,481 @@ class WiktionaryParser(object):
 
     # TODO (Once this is language-specific). Change way language works
     # It already changed, so language is only set in constructor
-    def fetch(self, word, old_id=None, return_word_class=True):
-        response = self.session.get(self.url.format(word), params={'oldid': old_id})
-        self.soup = BeautifulSoup(response.text.replace('>\n<', '><'), 'html.parser')
-        self.current_word = word
-        self.clean_html()
-        self.set_word_contents()
-        word_data = self.get_word_data()
+    def fetch(self, word, old_id=None, return_word_class=True, languages=None, lazy=False, sections=None,
+              as_records=False):
+        """Fetches and parses `word` (at revision `old_id`, if given) in the parser's language.
+        If `languages` is given, the page is downloaded and parsed once for all of them, and the result
+        is a {language: result} mapping instead (see `parse_languages`).
+        If `lazy`, the result is a LazyResult, whose sections are only parsed when accessed
+        (the result cache is not used, and `return_word_class` does not apply).
+        If `sections` is given (e.g. {'definitions', 'pronunciations'}), only those are parsed (see SECTIONS):
+        the others come out empty, and cost nothing (in particular, no subpage of translations is downloaded).
+        If `as_records`, the result is a list of WordData records, which take less memory than their json
+        (the result cache is not used, and `return_word_class` does not apply)."""
+        sections = _check_sections(sections)
+        if languages is not None:
+            return self._fetch_languages(word, old_id, languages, return_word_class, lazy, sections, as_records)
+        if lazy or as_records:
+            return self.parse(self._download(word, old_id), word, lazy=lazy, sections=sections, as_records=as_records)
+        word_data = None
+        if self.result_cache is not None:
+            key = self._result_key(word, old_id, sections=sections)
+            word_data = self.result_cache.get(key)
+        if word_data is None:
+            html = self._download(word, old_id)
+            word_data = self.parse(html, word, return_word_class=False, sections=sections)
+            if self.result_cache is not None:
+                word_data = self.result_cache.set(key, word_data)
         if not return_word_class:
             return word_data
+        else:
+            return Word(word_data, word)
+
+    def _fetch_languages(self, word, old_id, languages, return_word_class, lazy=False, sections=None,
+                         as_records=False):
+        # The whole page is needed, whatever the fetch mode
+        if lazy or as_records:
+            return self.parse_languages(self._download_page(word, old_id), word, languages, lazy=lazy,
+                                        sections=sections, as_records=as_records)
+        results, missing = self._cached_languages(word, old_id, languages, sections)
+        if missing:
+            parsed = self.parse_languages(self._download_page(word, old_id), word, missing, return_word_class=False,
+                                          sections=sections)
+            self._cache_languages(word, old_id, results, missing, parsed, sections)
+        if not return_word_class:
+            return results
+        else:
+            return OrderedDict((language, Word(word_data, word)) for language, word_data in results.items())
+
+    def _cached_languages(self, word, old_id, languages, sections=None):
+        """Returns ({language: cached result or None}, [languages missing from the result cache])."""
+        results = OrderedDict()
+        missing = []
+        for language in languages:
+            word_data = None
+            if self.result_cache is not None:
+                word_data = self.result_cache.get(self._result_key(word, old_id, language, 'page', sections))
+            if word_data is None:
+                missing.append(language)
+            results[language] = word_data
+        return results, missing
+
+    def _cache_languages(self, word, old_id, results, missing, parsed, sections=None):
+        """Fills `results` with the `parsed` results of the `missing` languages, and caches them.
+        Languages not found on the page are dropped."""
+        for language in missing:
+            if language not in parsed:
+                del results[language]
+                continue
+            word_data = parsed[language]
+            if self.result_cache is not None:
+                word_data = self.result_cache.set(self._result_key(word, old_id, language, 'page', sections), word_data)
+            results[language] = word_data
+
+    def _result_key(self, word, old_id=None, language=None, fetch_mode=None, sections=None):
+        return (
+            canonical_title(word),
+            '' if old_id is None else str(old_id),
+            self.language if language is None else language,
+            self.fetch_mode if fetch_mode is None else fetch_mode,
+            frozenset(self._included_parts_of_speech),
+            frozenset(self._included_relations),
+            frozenset(_check_sections(sections)),
+            None if self.translation_languages is None else frozenset(self.translation_languages),
+        )
+
+    def _get(self, url, params=None):
+        if self.rate_limiter is not None:
+            return self.rate_limiter.get(self.session, url, params=params)
+        return self.session.get(url, params=params)
+
+    def _download(self, word, old_id=None):
+        """Downloads what is needed to parse `word`, according to the parser's fetch mode."""
+        if self.fetch_mode == 'section':
+            return self._download_section(word, old_id)
+        return self._download_page(word, old_id)
+
+    def _download_page(self, word, old_id=None):
+        if self.cache is not None:
+            html = self.cache.get(word, old_id)
+            if html is not None:
+                return html
+        response = self._get(self.url.format(word), params={'oldid': old_id})
+        if self.cache is not None and response.ok:
+            self.cache.set(word, old_id, response.text)
+        return response.text
+
+    def _download_section(self, word, old_id=None):
+        """Downloads only the section of the parser's language, through the MediaWiki parse API.
+        The section is preceded by a table of contents built from the API's list of sections,
+        so that it can be parsed as a full page."""
+        variant = 'section:' + self.language
+        if self.cache is not None:
+            html = self.cache.get(word, old_id, variant=variant)
+            if html is not None:
+                return html
+        params = _parse_api_params(word, old_id)
+        response = self._get(self.api_url, params=dict(params, prop='sections'))
+        index, toc = _section_toc(_api_result(response.text)['sections'], self.language)
+        response = self._get(self.api_url, params=dict(params, prop='text', section=index, disableeditsection=1))
+        html = toc + _api_result(response.text)['text']
+        if self.cache is not None and response.ok:
+            self.cache.set(word, old_id, html, variant=variant)
+        return html
+
+    def parse(self, html, word, return_word_class=True, lazy=False, sections=None, as_records=False):
+        """Parses an already downloaded page (str or utf-8 bytes) of `word`, without any HTTP request
+        (except for translations that live in a subpage). Returns the same as `fetch`."""
+        sections = _check_sections(sections)
+        if self.slice_language:
+            # Only build the tree of the section of the language (if it is found)
+            html = _slice_language(html, self.language) or html
+        if lazy:
+            # Only the result references the tree, which is released once every section has been parsed
+            parser = self._spawn()
+            parser._prefetched = self._prefetched
+            parser.read_html(html, word)
+            parser.classify_contents()
+            return LazyResult(parser, sections)
+        self.read_html(html, word)
+        self.classify_contents()
+        word_data = self.get_word_data(sections, as_records)
+        if as_records or not return_word_class:
+            return word_data
         else:
             return Word(word_data, self.current_word)
 
+    def parse_languages(self, html, word, languages, return_word_class=True, lazy=False, sections=None,
+                        as_records=False):
+        """Parses an already downloaded page of `word` in each of `languages`, and returns
+        an ordered {language: result} mapping. The tree and its index are built only once, and shared
+        by the languages (as are the subpages of translations). Languages that are not in the page
+        are left out of the mapping. `slice_language` does not apply, since the whole page is needed."""
+        # Results parsed lazily are the only ones to reference the tree (see parse)
+        page_parser = self._spawn() if lazy else self
+        page_parser._prefetched = self._prefetched
+        page_parser.read_html(html, word)
+        results = OrderedDict()
+        for language in languages:
+            parser = page_parser._spawn()
+            parser.language = language
+            parser.current_word = word
+            parser.soup, parser.anchors, parser.headings = page_parser.soup, page_parser.anchors, page_parser.headings
+            parser._subpages, parser._prefetched = page_parser._subpages, page_parser._prefetched
+            try:
+                parser.classify_contents()
+            except EmptyWordContents:
+                logger.warning('Language not found for WORD:"{}": {}'.format(word, language))
+                continue
+            if lazy:
+                results[language] = LazyResult(parser, sections)
+                continue
+            word_data = parser.get_word_data(sections, as_records)
+            results[language] = Word(word_data, word) if return_word_class and not as_records else word_data
+        return results
+
+    def read_html(self, html, word):
+        """Builds the tree of a page (str or utf-8 bytes) of `word`, cleans it and indexes it."""
+        if isinstance(html, bytes):
+            html = html.decode('utf-8')
+        # Subpages of translations are only kept for the word they belong to (results parsed lazily keep their own)
+        self._subpages = {}
+        self.soup = BeautifulSoup(html.replace('>\n<', '><'), self.features)
+        self.current_word = word
+        self.clean_html()
+        self.index_document()
+
+    def _second_lookup(self, transl_senses):
+        """Returns the header of translations that live in a subpage (e.g. 'word/translations#Noun').
+        Each subpage is downloaded (with the parser's session and cache) and parsed at most once per word,
+        and all its anchors are resolved from a single index. Subpages given beforehand (downloaded along
+        with the page for parse workers, see fetch_many, or read from a dump, see parse_dump) are not downloaded."""
+        title2, anchor = _link_target(transl_senses[0][1].find('a').get('href'))
+        anchors = self._subpages.get(title2)
+        if anchors is None:
+            html2 = self._prefetched.get(canonical_title(title2))
+            if html2 is None:
+                html2 = self._download_page(title2)
+            soup2 = BeautifulSoup(html2, self.features)
+            _flatten_sections(soup2)
+            anchors, _ = _index_anchors(soup2)
+            self._subpages[title2] = anchors
+        logger.debug("Exit")
+        return anchors.get(anchor)
+
+    def _spawn(self):
+        """Returns a parser sharing this one's configuration and session,
+        but with its own per-word state (soup, ids, contents...)."""
+        parser = copy(self)
+        parser.clear()
+        return parser
+
+    def _download_with_subpages(self, word, old_id=None, sections=None):
+        """Downloads `word` for a parse worker, along with the subpages of translations it links to,
+        so that parse workers send no request, and every request goes through this parser's session
+        (and rate limiter). Returns (html, {canonical subpage title: html})."""
+        html = self._download(word, old_id)
+        subpages = {}
+        if 'translations' in _check_sections(sections):
+            for title in _subpage_titles(html):
+                subpages[canonical_title(title)] = self._download_page(title)
+        return html, subpages
+
+    def _worker_config(self):
+        """Picklable configuration from which parse workers rebuild this parser."""
+        return dict(
+            language=self.language,
+            cache=self.cache,
+            features=self.features,
+            slice_language=self.slice_language,
+            translation_languages=self.translation_languages,
+            included_parts_of_speech=set(self._included_parts_of_speech),
+            included_relations=set(self._included_relations),
+        )
+
+    def fetch_many(self, words, max_workers=8, return_word_class=True, parse_processes=None, sections=None):
+        """Fetches several words concurrently, and yields (word, result) pairs
+        as soon as each page is done (i.e. not necessarily in input order).
+        Items of `words` can be either words or (word, old_id) tuples.
+        If fetching or parsing a word fails, the exception is yielded in place of the result.
+
+        By default, pages are downloaded and parsed on `max_workers` threads.
+        If `parse_processes` is given, threads only download the pages (and the subpages of their
+        translations), and parsing is done on a pool of that many processes, so that it is not bound by the GIL.
+        `sections` restricts the parsed sections, as in `fetch`.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        _mount_adapters(self.session, pool_maxsize=max_workers, respect_retry_after=self.rate_limiter is None)
+        items = iter(words)
+        pending = {}
+        with ExitStack() as stack:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+            parse_executor = None
+            if parse_processes:
+                parse_executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=parse_processes, initializer=_init_parse_worker, initargs=(self._worker_config(),)))
+            while True:
+                # Keep a bounded number of pages in flight, so that long word lists are consumed lazily
+                for item in items:
+                    word, old_id = item if isinstance(item, tuple) else (item, None)
+                    if parse_executor is None:
+                        future = executor.submit(self._spawn().fetch, word, old_id, return_word_class,
+                                                 sections=sections)
+                    else:
+                        future = executor.submit(self._download_with_subpages, word, old_id, sections)
+                    pending[future] = (word, 'fetch')
+                    if len(pending) >= 2 * max_workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    word, stage = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning('Could not fetch WORD:"{}": {}'.format(word, e))
+                        yield word, e
+                        continue
+                    if parse_executor is not None and stage == 'fetch':
+                        # Ship the raw bytes to a parse worker, and wait for its result
+                        html, subpages = result
+                        future = parse_executor.submit(_parse_in_worker, html.encode('utf-8'), word, sections, subpages)
+                        pending[future] = (word, 'parse')
+                    elif parse_executor is not None and return_word_class:
+                        yield word, Word(result, word)
+                    else:
+                        yield word, result
+
+
+_worker_parser = None
+
+
+def _init_parse_worker(config):
+    """Initializer of parse processes: loads the package and builds the parser once per process."""
+    global _worker_parser
+    _worker_parser = WiktionaryParser(language=config['language'], cache=config['cache'], features=config['features'],
+                                      slice_language=config['slice_language'],
+                                      translation_languages=config['translation_languages'])
+    _worker_parser._included_parts_of_speech = config['included_parts_of_speech']
+    _worker_parser._included_relations = config['included_relations']
+
+
+def _parse_in_worker(content, word, sections=None, subpages=None):
+    """Parses a downloaded page in a parse process, with the subpages of its translations
+    if they were downloaded along with it. Returns the json-like word data."""
+    _worker_parser.clear()
+    _worker_parser._prefetched = subpages or {}
+    return _worker_parser.parse(content, word, return_word_class=False, sections=sections)
+
+
+def parse_html(html, word, language="english", return_word_class=True):
+    """Parses an already downloaded page (str or utf-8 bytes) of `word`,
+    e.g. from a crawler, a cache or a dump. Returns the same as `WiktionaryParser.fetch`."""
+    return WiktionaryParser(language=language).parse(html, word, return_word_class=return_word_class)
+
+
+def _check_sections(sections):
+    """Returns the sections to parse (all of them if `sections` is None), checking their names."""
+    if sections is None:
+        return set(SECTIONS)
+    sections = set(sections)
+    unknown = sections.difference(SECTIONS)
+    if unknown:
+        raise ValueError("Invalid sections: {}. Choose among: {}".format(sorted(unknown), SECTIONS))
+    return sections
+
+
+def _subpage_titles(html):
+    """Titles of the subpages of translations (e.g. 'word/translations') that a page links to."""
+    titles = []
+    for title in _SUBPAGE_LINK_RE.findall(html):
+        title = html_unescape(title)
+        if title not in titles:
+            titles.append(title)
+    return titles
+
+
+def _link_target(href):
+    """Returns the (title, anchor) of a link to a page of the wiki."""
+    for prefix in ('/wiki/', './'):
+        if href.startswith(prefix):
+            href = href[len(prefix):]
+            break
+    title, _, anchor = href.partition('#')
+    return title, anchor
+
+
+def _slice_language(html, language):
+    """Scans the raw page (str or bytes) for the h2 heading of `language` (the last one, if there are several),
+    and returns the page from that heading up to the next h2. Returns None if there is no such heading."""
+    if isinstance(html, bytes):
+        open_tag, close_tag = b'<h2', b'</h2>'
+    else:
+        open_tag, close_tag = '<h2', '</h2>'
+    start = None
+    position = html.find(open_tag)
+    while position >= 0:
+        end = html.find(close_tag, position)
+        if end < 0:
+            break
+        heading = html[position:end]
+        if isinstance(heading, bytes):
+            heading = heading.decode('utf-8', 'replace')
+        if html_unescape(re.sub(r'<[^>]*>', '', heading)).strip().lower() == language:
+            start = position
+        position = html.find(open_tag, end)
+    if start is None:
+        return None
+    end = html.find(open_tag, start + len(open_tag))
+    return html[start:end] if end >= 0 else html[start:]
+
+
+def _parse_api_params(word, old_id=None):
+    params = dict(action='parse', format='json', formatversion=2)
+    if old_id is not None:
+        params.update(oldid=old_id)
+    else:
+        params.update(page=word, redirects=1)
+    return params
+
+
+def _api_result(text):
+    data = json.loads(text)
+    if 'error' in data:
+        raise APIError(data['error'])
+    return data['parse']
+
+
+def _section_toc(sections, language):
+    """From the sections of a MediaWiki parse API response, returns the index of the section of `language`,
+    and a table of contents (html) of it and its subsections, like the one of printable pages."""
+    index = number = None
+    toc_entries = []
+    for section in sections:
+        line = re.sub(r'<[^>]*>', '', section['line'])
+        if number is None:
+            if section['toclevel'] == 1 and line.lower() == language:
+                index, number = section['index'], section['number']
+            else:
+                continue
+        elif not section['number'].startswith(number + '.'):
+            break
+        toc_entries.append(
+            '<li class="toclevel-{}"><a href="#{}"><span class="tocnumber">{}</span> '
+            '<span class="toctext">{}</span></a></li>'.format(
+                section['toclevel'], html_escape(section['anchor']), section['number'], section['line'])
+        )
+    if index is None:
+        logger.error("Language not found in sections: {}".format(language))
+        raise EmptyWordContents()
+    return index, '<div id="toc" class="toc"><ul>{}</ul></div>'.format(''.join(toc_entries))
+
+
+def _mount_adapters(session, pool_maxsize=requests.adapters.DEFAULT_POOLSIZE, respect_retry_after=True):
+    # When a RateLimiter is in use, it is the one handling throttled (Retry-After) responses
+    max_retries = Retry(2, read=False, respect_retry_after_header=respect_retry_after)
+    adapter_kwargs = dict(max_retries=max_retries, pool_maxsize=max(pool_maxsize, requests.adapters.DEFAULT_POOLSIZE))
+    session.mount("http://", requests.adapters.HTTPAdapter(**adapter_kwargs))
+    session.mount("https://", requests.adapters.HTTPAdapter(**adapter_kwargs))
+
+
+def _find_tags(soup, predicate):
+    """Returns the tags of `soup` for which `predicate` is true, in document order.
+    Same as soup.find_all(predicate), without the overhead of BeautifulSoup's matching machinery,
+    which is most of the cost of walking a large page."""
+    return [tag for tag in soup.find_all(True) if predicate(tag)]
+
+
+def _is_unwanted(tag):
+    classes = tag.get('class')
+    return bool(classes) and not _UNWANTED_CLASSES.isdisjoint(classes)
+
+
+def _index_anchors(soup):
+    """Returns the anchors and headings of a tree (see WiktionaryParser.index_document)."""
+    anchors = {}
+    headings = []
+    for tag in _find_tags(soup, _is_anchor_or_heading):
+        tag_id = tag.get('id')
+        if tag_id is not None:
+            anchors.setdefault(tag_id, tag)
+        if tag.name == 'span':
+            heading_tag = tag.parent
+            if 'mw-headline' in tag.get('class', []) and heading_tag.name in HEADING_TAGS:
+                headings.append((int(heading_tag.name[1]), tag_id, tag))
+        elif tag.find('span', {'class': 'mw-headline'}) is None:
+            # Headings without id (e.g. 'Navigation menu') cannot be sections, but still close the previous ones
+            headings.append((int(tag.name[1]), tag_id, tag))
+    return anchors, headings
+
+
+def _is_anchor_or_heading(tag):
+    return tag.name in SECTION_HEADING_TAGS or (tag.name == 'span' and tag.has_attr('id'))
+
+
+def _flatten_sections(soup):
+    """Brings other markups to the flat layout of printable pages, where the content of a section
+    follows its heading as siblings, up to the next heading:
+    - Parsoid HTML (e.g. of Wikimedia Enterprise dumps) nests each section in a <section> tag,
+    - current skins wrap each heading in a div.mw-heading, along with its edit link (which is dropped).
+    """
+    for wrapper_tag in _find_tags(soup, _is_section_wrapper):
+        if wrapper_tag.name == 'div':
+            for edit_tag in wrapper_tag.find_all('span', {'class': 'mw-editsection'}, recursive=False):
+                edit_tag.extract()
+        wrapper_tag.unwrap()
+
+
+def _is_section_wrapper(tag):
+    return tag.name == 'section' or (tag.name == 'div' and _has_class(tag, 'mw-heading'))
+
+
+def _heading_tag(anchor_tag):
+    """The heading (h2-h6 tag) of a section, from its anchor (see index_document)."""
+    return anchor_tag if anchor_tag.name in HEADING_TAGS else anchor_tag.parent
+
 
 def _is_subheading(child, parent):
     child_headings = child.split(".")
@@ -381,17 +929,6 @@ def _is_subheading(child, parent):
     return True
 
 
-def _second_lookup(url, transl_senses):
-    url2 = transl_senses[0][1].find('a').get('href').replace('/wiki/', '')
-    session2 = requests.Session()
-    session2.mount("http://", requests.adapters.HTTPAdapter(max_retries=2))
-    session2.mount("https://", requests.adapters.HTTPAdapter(max_retries=2))
-    response = session2.get(url.format(url2))
-    soup2 = BeautifulSoup(response.text, 'html.parser')
-    logger.debug("Exit")
-    return soup2.find('span', {'id': url2.split('#')[1]})
-
-
 def _get_senses(transl_header, info=None):
     """Builds and returns a dictionary of translation siblings (bs4.element.Tag),
     i.e. one for each of the senses of a word.
@@ -404,7 +941,7 @@ def _get_senses(transl_header, info=None):
     logger.debug("Enter")
     if info is None:
         info = {}
-    sense_tag = transl_header.parent.find_next_sibling()
+    sense_tag = _heading_tag(transl_header).find_next_sibling()
 
     if 'class' not in sense_tag.attrs:
         raise SenseLocationError(info)
@@ -413,10 +950,10 @@ def _get_senses(transl_header, info=None):
 
     senses = []
     while True:
-        # Check if the table of senses is over
+        # Check if the table of senses is over (at the next section, or at the end of the language's section)
         if sense_tag is None:
             break
-        if sense_tag.name in ['h3', 'h4', 'h5']:
+        if sense_tag.name in SECTION_HEADING_TAGS or sense_tag.name == 'hr':
             break
         if 'class' in sense_tag.attrs:
             if "NavFrame" not in sense_tag.attrs['class']:
@@ -436,10 +973,51 @@ def _get_senses(transl_header, info=None):
     return senses
 
 
-def _name_tag(item_tag, info=None):
+def _has_class(tag, class_name):
+    return class_name in tag.get('class', ())
+
+
+def _iter_tree(tag, skip=None):
+    """Yields the descendants of `tag` in document order, leaving out the subtrees
+    of the tags for which `skip` is true (as if they had been extracted)."""
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if skip is not None and skip(child):
+                continue
+            yield child
+            yield from _iter_tree(child, skip)
+        else:
+            yield child
+
+
+def _text(tag, skip=None, enclose=None):
+    """Returns the text of `tag`, as if the tags for which `skip` is true had been extracted,
+    and the tags for which `enclose` is true had been replaced by their text in brackets.
+    The tree is left untouched."""
+    parts = []
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if skip is not None and skip(child):
+                continue
+            if enclose is not None and enclose(child):
+                parts.append('[' + _text(child, skip) + ']')
+            else:
+                parts.append(_text(child, skip, enclose))
+        elif type(child) in _TEXT_TYPES:
+            parts.append(child)
+    return ''.join(parts)
+
+
+def _translation_text(item_tag, skip=None):
+    """Text of a translation item, without parts of speech ('tpos') and with genders in brackets.
+    Tags for which `skip` is true are left out as well."""
+    return _text(item_tag, lambda tag: _has_class(tag, 'tpos') or (skip is not None and skip(tag)),
+                 lambda tag: _has_class(tag, 'gender'))
+
+
+def _name_tag(text, info=None):
     if info is None:
         info = {}
-    text = item_tag.text
     info.update(text=text)
     if not ":" in text:
         raise MissingColonError(info=info)
@@ -480,21 +1058,13 @@ def _separate_items(text, info=None):
     return items_list
 
 
-def _extract_language_item(lang_tag, info=None):
+def _extract_language_item(lang_tag, info=None, skip=None):
     if info is None:
         info = {}
     logger.debug("Enter")
-    unwanted_classes = ['tpos']
-    enclose_classes = ['gender']
 
-    # Extract unwanted classes. Enclose genders
-    for tag in lang_tag.find_all(True, {'class': unwanted_classes}):
-        tag.extract()
-    for tag in lang_tag.find_all(True, {'class': enclose_classes}):
-        tag.replace_with('[' + tag.text + ']')
-
-    # Take text, and separate: lang & translation (by colon)
-    lang, items_text, info = _name_tag(lang_tag, info)
+    # Take text (without unwanted classes, and with genders enclosed), and separate: lang & translation (by colon)
+    lang, items_text, info = _name_tag(_translation_text(lang_tag, skip), info)
     items_list = _separate_items(items_text, info)
 
     if len(items_list) == 0:
@@ -505,11 +1075,11 @@ def _extract_language_item(lang_tag, info=None):
     return {lang.lower(): items_list if len(items_list) > 1 else items_list[0]}
 
 
-def _extract_language_item_safe(tag, info=None, reraise=False):
+def _extract_language_item_safe(tag, info=None, reraise=False, skip=None):
     if info is None:
         info = {}
     try:
-        new_items = _extract_language_item(tag, info=info)
+        new_items = _extract_language_item(tag, info=info, skip=skip)
     except MissingColonError as e:
         new_items = {}
         if reraise:
@@ -531,16 +1101,18 @@ def _extract_descriptions(lang_tag, info=None):
     lang = lang_tag.text.split(':')[0]
     info.update(language=lang)
     descriptions = OrderedDict()
-    main_lang_tag = copy(lang_tag)
-    main_lang_tag.find('dl').extract()
+    # The main entry is the item without its (first) list of descriptions
+    first_list_tag = lang_tag.find('dl')
+    skip_descriptions = lambda tag: tag is first_list_tag
+    main_text = _text(lang_tag, skip_descriptions)
 
-    if ':' not in main_lang_tag.text:
+    if ':' not in main_text:
         raise MissingColonError(info=info)
 
-    if main_lang_tag.text.replace('\n', '').split(':')[1] != '':
+    if main_text.replace('\n', '').split(':')[1] != '':
         # There is still a main entry
-        logger.debug('SENDING {}'.format(main_lang_tag))
-        descriptions.update(_extract_language_item_safe(main_lang_tag, info=info))
+        logger.debug('SENDING {}'.format(main_text))
+        descriptions.update(_extract_language_item_safe(lang_tag, info=info, skip=skip_descriptions))
 
     # For each dialect (description)
     for descr_tag in lang_tag.find_all('dd'):
@@ -558,24 +1130,37 @@ def _extract_descriptions(lang_tag, info=None):
                 else:
                     last_key = lang.lower()
                     last_val = ''
+                descr = _translation_text(descr_tag)
                 if isinstance(last_val, list):
-                    to_update = '; '.join(last_val + [descr_tag.text])  # Convert to text (semicolon)
+                    to_update = '; '.join(last_val + [descr])  # Convert to text (semicolon)
                 elif isinstance(last_val, str):
-                    to_update = last_val + '; ' + descr_tag.text  # semicolons
+                    to_update = last_val + '; ' + descr  # semicolons
                 logger.debug("Adding colonless description to LANG:{}".format(info.get('language')))
                 descriptions.update({last_key: to_update})
         else:
             logger.debug('SPECIAL CASE. LANG: {}, YES dl: {}'.format(lang, descr_tag))
             for sub_descr_tag in descr_tag.find_all('dl'):
                 descriptions.update(_extract_language_item_safe(sub_descr_tag, info=info))
-                sub_descr_tag.extract()
-            descriptions.update(_extract_language_item_safe(descr_tag, info=info))
+            descriptions.update(_extract_language_item_safe(descr_tag, info=info, skip=lambda tag: tag.name == 'dl'))
 
     logger.debug("Exit")
     return lang, dict(descriptions)
 
 
-def _extract_languages(sense_tag, info=None):
+def _language_label(lang_tag):
+    """Returns the language of a row of a translations table (the text before the colon),
+    reading no more of the row than needed."""
+    label = ''
+    for string in lang_tag.strings:
+        if ':' in string:
+            return label + string.split(':', 1)[0]
+        label += string
+    return label
+
+
+def _extract_languages(sense_tag, info=None, languages=None):
+    """Returns {language: translations} from a table of translations.
+    If `languages` (lowercase) is given, the rows of other languages are skipped before any processing."""
     if info is None:
         info = {}
     logger.debug("Enter")
@@ -601,6 +1186,8 @@ def _extract_languages(sense_tag, info=None):
 
     lang_dict = {}
     for lang_tag in lang_tags:
+        if languages is not None and _language_label(lang_tag).strip().lower() not in languages:
+            continue
         if not lang_tag.find_all('dl'):
             # There are no dialects (sub-items in a language)
             info.update(language=lang_tag.text)
@@ -614,12 +1201,12 @@ def _extract_languages(sense_tag, info=None):
     return lang_dict
 
 
-def _extract_languages_safe(sense_tag, info=None):
+def _extract_languages_safe(sense_tag, info=None, languages=None):
     if info is None:
         info = {}
     logger.debug("Enter")
     try:
-        return _extract_languages(sense_tag, info=info)
+        return _extract_languages(sense_tag, info=info, languages=languages)
     except TranslationParsingError as e:
         logger.warning(e)
     except Exception as e:
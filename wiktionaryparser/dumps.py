@@ -0,0 +1,149 @@
+import io, bz2, gzip, json, tarfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from wiktionaryparser.core import WiktionaryParser, _init_parse_worker, _parse_in_worker, _subpage_titles
+from wiktionaryparser.cache import canonical_title
+from wiktionaryparser.logger import logger
+from wiktionaryparser.utils import Word
+
+DumpPage = namedtuple('DumpPage', ['title', 'namespace', 'old_id', 'html'])
+
+
+def _open_lines(path):
+    """Yields the lines (bytes) of every NDJSON file in `path`, decompressing on the fly.
+    `path` can be a .tar.gz archive of NDJSON files (as Wikimedia Enterprise HTML dumps are),
+    or a single NDJSON file, possibly compressed with gzip or bz2."""
+    if path.endswith(('.tar.gz', '.tgz', '.tar')):
+        # Stream mode: members are read sequentially, without seeking nor extracting to disk
+        with tarfile.open(path, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                logger.debug("Reading {}".format(member.name))
+                yield from archive.extractfile(member)
+    elif path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            yield from f
+    elif path.endswith('.bz2'):
+        with bz2.open(path, 'rb') as f:
+            yield from f
+    else:
+        with io.open(path, 'rb') as f:
+            yield from f
+
+
+def iter_html_dump(path, titles=None, namespaces=(0,)):
+    """Yields the pages (DumpPage) of a Wikimedia Enterprise HTML dump one at a time,
+    so that memory use does not depend on the size of the dump.
+    - `titles`: if given, only pages with these titles are yielded.
+    - `namespaces`: if given, only pages in these namespaces are yielded (0 is the main namespace).
+    """
+    if titles is not None:
+        titles = {canonical_title(title) for title in titles}
+    for line in _open_lines(path):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        namespace = record.get('namespace', {}).get('identifier')
+        if namespaces is not None and namespace not in namespaces:
+            continue
+        title = record.get('name')
+        if titles is not None and canonical_title(title) not in titles:
+            continue
+        html = record.get('article_body', {}).get('html')
+        if not html:
+            continue
+        yield DumpPage(title, namespace, record.get('version', {}).get('identifier'), html)
+
+
+def _is_subpage_of_translations(title):
+    return canonical_title(title).endswith('/translations')
+
+
+def _with_subpages(pages):
+    """Yields (page, {canonical subpage title: html}) pairs, with the subpages of translations that each page
+    links to, as read from the dump. Subpages are not yielded themselves. Pages are held back until their
+    subpages are read (wherever they are in the dump), or until the end of the dump; and a subpage is only kept
+    until the page it belongs to (e.g. 'water' for 'water/translations') has been yielded."""
+    subpages = {}
+    waiting = {}  # {subpage title: [pages waiting for it]}
+    missing = {}  # {id(page): subpage titles it still waits for}
+
+    def resolved(page):
+        page_subpages = {}
+        for title in map(canonical_title, _subpage_titles(page.html)):
+            if title in subpages:
+                page_subpages[title] = subpages[title]
+        subpages.pop(canonical_title(page.title) + '/translations', None)
+        return page, page_subpages
+
+    for page in pages:
+        if _is_subpage_of_translations(page.title):
+            title = canonical_title(page.title)
+            subpages[title] = page.html
+            for waiting_page in waiting.pop(title, []):
+                missing[id(waiting_page)].discard(title)
+                if not missing[id(waiting_page)]:
+                    del missing[id(waiting_page)]
+                    yield resolved(waiting_page)
+            continue
+        page_missing = {title for title in map(canonical_title, _subpage_titles(page.html)) if title not in subpages}
+        if not page_missing:
+            yield resolved(page)
+            continue
+        missing[id(page)] = page_missing
+        for title in page_missing:
+            waiting.setdefault(title, []).append(page)
+    # Subpages that are not in the dump are downloaded when parsing
+    held_back = {id(page): page for pages_of_title in waiting.values() for page in pages_of_title}
+    for page in held_back.values():
+        yield resolved(page)
+
+
+def parse_dump(path, language="english", titles=None, namespaces=(0,), return_word_class=True, processes=None):
+    """Parses every page of a Wikimedia Enterprise HTML dump, yielding (title, result) pairs.
+    Pages of dumps are Parsoid HTML, whose nested sections are flattened before parsing.
+    Subpages of translations (e.g. 'water/translations') are read from the dump as well (see `_with_subpages`):
+    only those missing from it are downloaded.
+    If parsing a page fails, the exception is yielded in place of the result.
+    If `processes` is given, pages are parsed on a pool of that many processes
+    (and yielded as soon as they are done, i.e. not necessarily in dump order).
+    """
+    if titles is not None:
+        titles = list(titles) + [canonical_title(title) + '/translations' for title in titles]
+    pages = _with_subpages(iter_html_dump(path, titles=titles, namespaces=namespaces))
+    parser = WiktionaryParser(language=language)
+    if not processes:
+        for page, subpages in pages:
+            parser._prefetched = subpages
+            try:
+                yield page.title, parser.parse(page.html, page.title, return_word_class=return_word_class)
+            except Exception as e:
+                logger.warning('Could not parse WORD:"{}": {}'.format(page.title, e))
+                yield page.title, e
+            parser.clear()
+        return
+
+    pending = {}
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_parse_worker,
+                             initargs=(parser._worker_config(),)) as executor:
+        while True:
+            # Keep a bounded number of pages in flight, so that memory use stays constant
+            for page, subpages in pages:
+                future = executor.submit(_parse_in_worker, page.html.encode('utf-8'), page.title, None, subpages)
+                pending[future] = page.title
+                if len(pending) >= 2 * processes:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                title = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning('Could not parse WORD:"{}": {}'.format(title, e))
+                    yield title, e
+                    continue
+                yield title, Word(result, title) if return_word_class else result
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+
+
+def index_path(index):
+    """Numeric path of a section index of the table of contents, e.g. '3.10.1' -> (3, 10, 1).
+    The empty index (of the entry of a word without etymology sections) is the empty path."""
+    return tuple(int(number) for number in index.split('.')) if index else ()
+
+
+class SectionLayout(object):
+    """Tree of the sections of a word, built from the indexes of its etymologies and definitions,
+    to which the results of the other sections are attached.
+
+    Indexes are compared as numeric paths (so that '3.2' comes before '3.10'), and every section
+    is attached to its owner with a lookup, in a single pass over the sections:
+    - definitions belong to the entry of the etymology they follow (a single entry if there is no etymology),
+    - examples and related words belong to the definition they are (a subsection of),
+    - translations belong to the definition they follow,
+    - pronunciations belong to the etymology they follow, or to every etymology at their same level
+        (the last one in the page is kept).
+    """
+
+    def __init__(self, etymology_indexes, definition_indexes):
+        self.etymology_paths = [index_path(index) for index in etymology_indexes] or [()]
+        self.definition_paths = [index_path(index) for index in definition_indexes]
+        self._definitions = {path: position for position, path in enumerate(self.definition_paths)}
+        # Positions of the definitions of each entry (one entry per etymology)
+        self.entries = [[] for _ in self.etymology_paths]
+        for position, path in enumerate(self.definition_paths):
+            owner = self.etymology_of(path)
+            if owner is not None:
+                self.entries[owner].append(position)
+
+    def etymology_of(self, path):
+        """Position of the etymology that `path` follows, or None."""
+        position = bisect_right(self.etymology_paths, path) - 1
+        return position if position >= 0 else None
+
+    def definition_of(self, path):
+        """Position of the definition that `path` is, or is a subsection of, or None."""
+        for depth in range(len(path), 0, -1):
+            position = self._definitions.get(path[:depth])
+            if position is not None:
+                return position
+        return None
+
+    def preceding_definition(self, path):
+        """Position of the definition that `path` follows, or None."""
+        position = bisect_right(self.definition_paths, path) - 1
+        return position if position >= 0 else None
+
+    def attach(self, section, section_data):
+        """Attaches the result of the parse_* method of `section` (see SECTIONS) to its owners.
+        Returns {position of the owner (etymology or definition): attached value}."""
+        if section == 'etymologies':
+            return {position: text for position, (_, text) in enumerate(section_data)}
+        if section == 'definitions':
+            return {position: (text, part_of_speech) for position, (_, text, part_of_speech) in enumerate(section_data)}
+        if section == 'pronunciations':
+            return self._attach_pronunciations(section_data)
+        attached = {}
+        if section == 'examples':
+            for index, examples, _ in section_data:
+                owner = self.definition_of(index_path(index))
+                if owner is not None:
+                    attached[owner] = examples
+        elif section == 'related':
+            for index, words, relation_type in section_data:
+                owner = self.definition_of(index_path(index))
+                if owner is not None:
+                    attached.setdefault(owner, []).append((relation_type, words))
+        elif section == 'translations':
+            for index, senses in section_data:
+                owner = self.preceding_definition(index_path(index))
+                if owner is not None:
+                    attached.setdefault(owner, []).extend(senses)
+        else:
+            raise ValueError("Invalid section: {}".format(section))
+        return attached
+
+    def _attach_pronunciations(self, section_data):
+        last_following = {}
+        last_at_level = {}
+        for position, (index, _, _) in enumerate(section_data):
+            path = index_path(index)
+            owner = self.etymology_of(path)
+            if owner is not None:
+                last_following[owner] = position
+            last_at_level[len(path)] = position
+        attached = {}
+        for owner, etymology_path in enumerate(self.etymology_paths):
+            position = max(last_following.get(owner, -1), last_at_level.get(len(etymology_path), -1))
+            if position >= 0:
+                _, text, audio_links = section_data[position]
+                attached[owner] = (text, audio_links)
+        return attached
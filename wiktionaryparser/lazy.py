@@ -0,0 +1,148 @@
+import threading
+
+from wiktionaryparser.layout import SectionLayout
+from wiktionaryparser.utils import RelatedWord, TranslationSense
+
+SECTIONS = ['examples', 'definitions', 'etymologies', 'related', 'pronunciations', 'translations']
+
+_PARSE_METHODS = {
+    'examples': 'parse_examples',
+    'definitions': 'parse_definitions',
+    'etymologies': 'parse_etymologies',
+    'related': 'parse_related_words',
+    'pronunciations': 'parse_pronunciations',
+    'translations': 'parse_translations',
+}
+
+
+class LazyResult(object):
+    """Lazy counterpart of the list of entries returned by `fetch(..., return_word_class=False)`.
+
+    The structure (entries per etymology, definitions per entry) only depends on the table of contents,
+    so it is known upfront. Each section (etymologies, pronunciations, definitions, examples, related
+    words and translations) is only parsed the first time something from it is accessed, and then memoized.
+    If `sections` is given, the other sections are empty, and never parsed (see WiktionaryParser.get_word_data).
+    The parser, and thus the tree of the page, is released once every section has been parsed.
+    `to_json()` returns the same as the eager parse.
+    """
+
+    def __init__(self, parser, sections=None):
+        self.word = parser.current_word
+        self.language = parser.language
+        self._parser = parser
+        # Sections left out only depend on the table of contents
+        self._sections = {name: parser.empty_section(name) for name in SECTIONS
+                          if sections is not None and name not in sections}
+        if len(self._sections) == len(SECTIONS):
+            self._parser = None
+        self._attached = {}
+        self._lock = threading.Lock()
+        ids = parser.ids
+        self._layout = SectionLayout([index for index, _, _ in ids['etymologies']],
+                                     [index for index, _, _ in ids['definitions']])
+        definitions = [LazyDefinition(self, position, index, '' if title == 'definitions' else title)
+                       for position, (index, _, title) in enumerate(ids['definitions'])]
+        self.entries = [LazyEntry(self, position, [definitions[definition] for definition in entry_definitions])
+                        for position, entry_definitions in enumerate(self._layout.entries)]
+
+    def section(self, name):
+        """Returns the result of the parse_* method of the section `name` (see SECTIONS), parsing it if needed."""
+        with self._lock:
+            if name not in self._sections:
+                # The parse_* methods leave the tree untouched, so sections can be parsed in any order
+                self._sections[name] = getattr(self._parser, _PARSE_METHODS[name])()
+                if len(self._sections) == len(SECTIONS):
+                    self._parser = None
+            return self._sections[name]
+
+    def attached(self, name):
+        """Returns the section `name` attached to its owners (see SectionLayout.attach)."""
+        attached = self._attached.get(name)
+        if attached is None:
+            attached = self._attached[name] = self._layout.attach(name, self.section(name))
+        return attached
+
+    @property
+    def evaluated(self):
+        """Names of the sections parsed so far (sections left out count as parsed)."""
+        return set(self._sections)
+
+    def to_json(self):
+        return [entry.to_json() for entry in self.entries]
+
+    def __getitem__(self, item):
+        return self.entries[item]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class LazyEntry(object):
+    """Entry of a LazyResult: an etymology and the pronunciations and definitions that go with it."""
+
+    def __init__(self, result, position, definitions):
+        self._result = result
+        self._position = position
+        self.definitions = definitions
+
+    @property
+    def etymology(self):
+        return self._result.attached('etymologies').get(self._position, '')
+
+    @property
+    def pronunciations(self):
+        return self._result.attached('pronunciations').get(self._position, ([], []))[0]
+
+    @property
+    def audio_links(self):
+        return self._result.attached('pronunciations').get(self._position, ([], []))[1]
+
+    def to_json(self):
+        return {
+            'etymology': self.etymology,
+            'definitions': [definition.to_json() for definition in self.definitions],
+            'pronunciations': {
+                'text': self.pronunciations,
+                'audio': self.audio_links
+            }
+        }
+
+
+class LazyDefinition(object):
+    """Definition of a LazyEntry. Its part of speech is known upfront, the rest is parsed on access."""
+
+    def __init__(self, result, position, index, part_of_speech):
+        self._result = result
+        self._position = position
+        self.index = index
+        self.part_of_speech = part_of_speech
+
+    @property
+    def text(self):
+        return self._result.attached('definitions')[self._position][0]
+
+    @property
+    def example_uses(self):
+        return self._result.attached('examples').get(self._position, [])
+
+    @property
+    def related_words(self):
+        return [RelatedWord(relation_type, words)
+                for relation_type, words in self._result.attached('related').get(self._position, [])]
+
+    @property
+    def translations(self):
+        return [TranslationSense(sense, translations_dict)
+                for sense, translations_dict in self._result.attached('translations').get(self._position, [])]
+
+    def to_json(self):
+        return {
+            'partOfSpeech': self.part_of_speech,
+            'text': self.text,
+            'relatedWords': [related_word.to_json() for related_word in self.related_words],
+            'examples': self.example_uses,
+            'translations': [sense.to_json() for sense in self.translations],
+        }
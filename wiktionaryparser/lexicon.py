@@ -0,0 +1,263 @@
+import re, json, zlib
+from abc import ABCMeta, abstractmethod
+from collections import namedtuple
+
+from wiktionaryparser.cache import canonical_title, _SQLiteStore
+from wiktionaryparser.logger import logger
+from wiktionaryparser.utils import Word
+
+_TOKEN_RE = re.compile(r'\w+')
+
+LexiconMatch = namedtuple('LexiconMatch', ['word', 'language', 'entry', 'definition'])
+
+
+def tokenize(text):
+    """Lowercase word tokens of a text, as indexed in the 'text' field."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _to_json(word_data):
+    """Json entries of a parse result (json, Word, WordData records or LazyResult)."""
+    if isinstance(word_data, Word):
+        return word_data._json_data
+    if hasattr(word_data, 'to_json'):
+        return word_data.to_json()
+    return [entry.to_json() if hasattr(entry, 'to_json') else entry for entry in word_data]
+
+
+def _definition_terms(word, language, definition):
+    """Yields the (field, term) pairs under which a definition is indexed."""
+    yield 'word', word.lower()
+    yield 'language', language.lower()
+    yield 'pos', definition.get('partOfSpeech', '').lower()
+    for line in definition.get('text', []):
+        for token in tokenize(line):
+            yield 'text', token
+    for related_word in definition.get('relatedWords', []):
+        relation_type = related_word.get('relationshipType', '').lower()
+        yield 'relation', relation_type
+        for line in related_word.get('words', []):
+            for target in line.split(','):
+                target = target.strip().lower()
+                if target:
+                    # Targets are indexed both by their relation type (e.g. 'synonyms') and under 'related'
+                    yield relation_type, target
+                    yield 'related', target
+    for sense in definition.get('translations', []):
+        for translation_language in sense.get('translations', {}):
+            yield 'translation', translation_language.lower()
+
+
+class Query(metaclass=ABCMeta):
+    """Boolean query on a Lexicon. Queries are combined with & (and), | (or) and ~ (not)."""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    @abstractmethod
+    def _sql(self):
+        """Returns (sql, params) of a select of the ids of the matching definitions."""
+
+
+class Term(Query):
+    """Definitions indexed with `value` in `field`. Fields are:
+    - 'word', 'language', 'pos' (part of speech),
+    - 'text': the tokens of the definition (a value of several tokens matches definitions with all of them),
+    - 'relation': the types of its related words (e.g. 'synonyms'), 'related': the related words themselves,
+        which can also be queried by their type, e.g. Term('synonyms', 'chair'),
+    - 'translation': the languages it is translated into.
+    Values are compared in lowercase.
+    """
+
+    def __init__(self, field, value):
+        self.field = field.lower()
+        self.value = value.lower()
+
+    def _sql(self):
+        if self.field == 'text':
+            tokens = tokenize(self.value)
+            if len(tokens) != 1:
+                return And(*[Term('text', token) for token in tokens])._sql()
+        return "SELECT definition_id FROM postings WHERE field = ? AND term = ?", [self.field, self.value]
+
+    def __repr__(self):
+        return 'Term({!r}, {!r})'.format(self.field, self.value)
+
+
+class _Compound(Query):
+    OPERATOR = None
+
+    def __init__(self, *queries):
+        if not queries:
+            raise ValueError("{} needs at least one query".format(type(self).__name__))
+        self.queries = queries
+
+    def _sql(self):
+        selects, params = [], []
+        for query in self.queries:
+            sql, query_params = query._sql()
+            # Operands of compound selects cannot be compound themselves, unless they are subqueries
+            selects.append("SELECT definition_id FROM ({})".format(sql))
+            params.extend(query_params)
+        return " {} ".format(self.OPERATOR).join(selects), params
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(map(repr, self.queries)))
+
+
+class And(_Compound):
+    OPERATOR = 'INTERSECT'
+
+
+class Or(_Compound):
+    OPERATOR = 'UNION'
+
+
+class Not(Query):
+    def __init__(self, query):
+        self.query = query
+
+    def _sql(self):
+        sql, params = self.query._sql()
+        return "SELECT id AS definition_id FROM definitions EXCEPT SELECT definition_id FROM ({})".format(sql), params
+
+    def __repr__(self):
+        return 'Not({!r})'.format(self.query)
+
+
+class Lexicon(_SQLiteStore):
+    """Persistent inverted index of parsed words, to query a whole crawl without loading every entry.
+
+    Definitions are indexed by their words, parts of speech, tokens, related words and translation languages
+    (see Term), in a SQLite database. The entries themselves are stored zlib-compressed, and only
+    loaded on demand (see `get` and `definition`).
+    Example:
+        lexicon = Lexicon('lexicon.sqlite')
+        lexicon.update(parser.fetch_many(words, return_word_class=False))
+        lexicon.search(Term('pos', 'noun') & Term('text', 'furniture'))
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS words ("
+                "id INTEGER PRIMARY KEY, word TEXT NOT NULL, language TEXT NOT NULL, data BLOB NOT NULL, "
+                "UNIQUE (word, language))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS definitions ("
+                "id INTEGER PRIMARY KEY, word_id INTEGER NOT NULL, entry INTEGER NOT NULL, position INTEGER NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS definitions_word_id ON definitions (word_id)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                "field TEXT NOT NULL, term TEXT NOT NULL, definition_id INTEGER NOT NULL, "
+                "PRIMARY KEY (field, term, definition_id)) WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS postings_definition_id ON postings (definition_id)")
+
+    def add(self, word, word_data, language="english"):
+        """Indexes the parse result of `word` (json, Word, WordData records or LazyResult) in `language`,
+        replacing any previous one. `word_data` can also be a {language: result} mapping, as returned by
+        `fetch(..., languages=[...])`, in which case `language` does not apply."""
+        with self._connection() as connection:
+            self._add_result(connection, word, word_data, language)
+
+    def update(self, results, language="english"):
+        """Indexes many results in a single transaction. Items of `results` are either (word, result) pairs,
+        e.g. from `fetch_many` or `parse_dump`, whose results are in `language` (or are {language: result}
+        mappings, see `add`), or (word, language, result) triples. Results that are exceptions are skipped."""
+        with self._connection() as connection:
+            for item in results:
+                if len(item) == 3:
+                    word, item_language, word_data = item
+                else:
+                    (word, word_data), item_language = item, language
+                if isinstance(word_data, Exception):
+                    logger.debug('Not indexing WORD:"{}": {}'.format(word, word_data))
+                    continue
+                self._add_result(connection, word, word_data, item_language)
+
+    def _add_result(self, connection, word, word_data, language):
+        if isinstance(word_data, dict):
+            for result_language, language_data in word_data.items():
+                self._add(connection, word, _to_json(language_data), result_language)
+        else:
+            self._add(connection, word, _to_json(word_data), language)
+
+    def _add(self, connection, word, word_data, language):
+        word, language = canonical_title(word), language.lower()
+        self._delete(connection, word, language)
+        data = zlib.compress(json.dumps(word_data, ensure_ascii=False).encode('utf-8'))
+        word_id = connection.execute(
+            "INSERT INTO words (word, language, data) VALUES (?, ?, ?)", (word, language, data)
+        ).lastrowid
+        for entry_index, entry in enumerate(word_data):
+            for position, definition in enumerate(entry.get('definitions', [])):
+                definition_id = connection.execute(
+                    "INSERT INTO definitions (word_id, entry, position) VALUES (?, ?, ?)", (word_id, entry_index, position)
+                ).lastrowid
+                connection.executemany(
+                    "INSERT OR IGNORE INTO postings VALUES (?, ?, ?)",
+                    ((field, term, definition_id) for field, term in _definition_terms(word, language, definition))
+                )
+
+    def _delete(self, connection, word, language):
+        row = connection.execute("SELECT id FROM words WHERE word = ? AND language = ?", (word, language)).fetchone()
+        if row is None:
+            return
+        connection.execute(
+            "DELETE FROM postings WHERE definition_id IN (SELECT id FROM definitions WHERE word_id = ?)", row
+        )
+        connection.execute("DELETE FROM definitions WHERE word_id = ?", row)
+        connection.execute("DELETE FROM words WHERE id = ?", row)
+
+    def delete(self, word, language="english"):
+        with self._connection() as connection:
+            self._delete(connection, canonical_title(word), language.lower())
+
+    def search(self, query):
+        """Returns the definitions matching `query` (see Query), as LexiconMatch(word, language, entry, definition),
+        where `entry` and `definition` are the positions of the definition in the result of the word."""
+        sql, params = query._sql()
+        rows = self._connection().execute(
+            "SELECT words.word, words.language, definitions.entry, definitions.position "
+            "FROM definitions JOIN words ON words.id = definitions.word_id "
+            "WHERE definitions.id IN ({}) ORDER BY definitions.id".format(sql), params
+        )
+        return [LexiconMatch(*row) for row in rows]
+
+    def get(self, word, language="english"):
+        """Returns the indexed result (json) of `word`, or None."""
+        row = self._connection().execute(
+            "SELECT data FROM words WHERE word = ? AND language = ?", (canonical_title(word), language.lower())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def definition(self, match):
+        """Returns the definition (json) of a LexiconMatch."""
+        return self.get(match.word, match.language)[match.entry]['definitions'][match.definition]
+
+    def terms(self, field):
+        """Returns the distinct terms indexed in `field`, e.g. the parts of speech."""
+        rows = self._connection().execute("SELECT DISTINCT term FROM postings WHERE field = ? ORDER BY term", (field,))
+        return [term for term, in rows]
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def __contains__(self, key):
+        word, language = key if isinstance(key, tuple) else (key, "english")
+        row = self._connection().execute(
+            "SELECT 1 FROM words WHERE word = ? AND language = ?", (canonical_title(word), language.lower())
+        ).fetchone()
+        return row is not None
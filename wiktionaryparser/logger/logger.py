@@ -1,12 +1,14 @@
 # Alternative solution:
 # https://stackoverflow.com/questions/10973362/python-logging-function-name-file-name-line-number-using-a-single-file#10974508
 
-import logging
+import logging, os
 from wiktionaryparser.definitions import PATH_LOG
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+if not os.path.isdir(os.path.dirname(PATH_LOG)):
+    os.makedirs(os.path.dirname(PATH_LOG))
 file_handler = logging.FileHandler(PATH_LOG, 'w')
 file_handler.setLevel(logging.DEBUG)
 file_format = "%(asctime)s %(levelname)8s [%(filename)s:%(lineno)s - %(funcName)20s() ] %(message)s"
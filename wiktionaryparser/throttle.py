@@ -0,0 +1,106 @@
+import time, random, threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from wiktionaryparser.logger import logger
+
+RETRY_STATUSES = {429, 503}
+
+
+class RateLimiter(object):
+    """Client-side politeness scheduler, meant to be shared by all the fetches of one or more parsers.
+
+    - `rate`: sustained number of requests per second (token bucket). None means no limit.
+    - `burst`: number of requests that can be sent at once after some idle time.
+    - `max_per_host`: maximum number of concurrent requests to a same host. None means no limit.
+    - `max_retries`: number of retries of throttled requests (HTTP 429 and 503).
+    - `backoff`, `max_backoff`: base and cap (in seconds) of the exponential backoff between retries.
+        Actual delays are jittered. A `Retry-After` header, if any, takes precedence, and it pauses
+        every request (not only the throttled one), since the server asked the whole client to slow down.
+    """
+
+    def __init__(self, rate=None, burst=1, max_per_host=None, max_retries=5, backoff=1.0, max_backoff=60.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._paused_until = 0.
+        self._lock = threading.Lock()
+        self._host_semaphores = {}
+
+    def reserve(self):
+        """Takes a token, and returns how long (in seconds) the caller has to wait before sending its request."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._paused_until - now, 0.)
+            if self.rate is None:
+                return delay
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def host_slot(self, host):
+        if self.max_per_host is None:
+            yield
+            return
+        with self._lock:
+            semaphore = self._host_semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            yield
+
+    def should_retry(self, status_code, attempt):
+        return status_code in RETRY_STATUSES and attempt < self.max_retries
+
+    def retry_delay(self, attempt, retry_after=None):
+        """Returns how long to wait before retrying a throttled request, for the `attempt`-th time (from 0).
+        If the server sent a Retry-After delay, every request is paused until it elapses."""
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            # Exponential backoff with "full jitter"
+            return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def get(self, session, url, **kwargs):
+        """Sends a GET request with `session`, respecting the limits, and retrying throttled requests."""
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            with self.host_slot(host):
+                self.wait()
+                response = session.get(url, **kwargs)
+            if not self.should_retry(response.status_code, attempt):
+                return response
+            delay = self.retry_delay(attempt, response.headers.get('Retry-After'))
+            logger.debug("HTTP {} from {}. Retrying in {:.2f}s".format(response.status_code, host, delay))
+            time.sleep(delay)
+            attempt += 1
+
+
+def _parse_retry_after(value):
+    """Returns the delay (in seconds) of a Retry-After header, given either in seconds or as an HTTP date."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.)
+    except (TypeError, ValueError):
+        return None
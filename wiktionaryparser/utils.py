@@ -1,51 +1,138 @@
-from collections import defaultdict
+from bisect import bisect_left
+from collections import defaultdict, namedtuple, OrderedDict
 from wiktionaryparser.dicts import PARTS_OF_SPEECH_DICT
 
+TranslationEntry = namedtuple('TranslationEntry', ['part_of_speech', 'sense', 'translations'])
+
+
+class _memoized_property(object):
+    """Property computed on first access, and then stored in the instance
+    (functools.cached_property is not available before python 3.8)."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
 class Word:
+    """View on the json data of a word. Every view is only computed when it is first accessed,
+    and the translations are only put together for the languages that are asked for."""
+
     def __init__(self, json_data, name=None):
         self._json_data = json_data
         self.name = name
-        self.structure = [['{}'.format(PARTS_OF_SPEECH_DICT[elll.get('partOfSpeech')]) for elll in ell] for ell in
-                          [el.get('definitions') for el in self._json_data]]
-        self._pronunciation = [el.get('pronunciations').get('text') for el in self._json_data]
-        self._etymology = [el.get('etimology') for el in self._json_data]
-        self._meaning = [
-            ['({}) {}'.format(PARTS_OF_SPEECH_DICT[elll.get('partOfSpeech')], '\n'.join(elll.get('text'))) for elll in
-             ell] for ell in [el.get('definitions') for el in self._json_data]]
-        self._meaning0 = [['{}'.format('\n'.join(elll.get('text'))) for elll in ell] for ell in
-                          [el.get('definitions') for el in self._json_data]]
-        self._languages = []
-        self._translation_lst = defaultdict(dict)
-        self._translation_txt = defaultdict(str)
-        self.items = []
-        self._parse_translations()
-
-    def _parse_translations(self):
-
-        for element in self._json_data: # usually only one element
+        self._translation_texts = {}
+
+    @_memoized_property
+    def structure(self):
+        return [['{}'.format(PARTS_OF_SPEECH_DICT[elll.get('partOfSpeech')]) for elll in ell] for ell in
+                [el.get('definitions') for el in self._json_data]]
+
+    @_memoized_property
+    def _pronunciation(self):
+        return [el.get('pronunciations').get('text') for el in self._json_data]
+
+    @_memoized_property
+    def _etymology(self):
+        return [el.get('etimology') for el in self._json_data]
+
+    @_memoized_property
+    def _meaning(self):
+        return [['({}) {}'.format(PARTS_OF_SPEECH_DICT[elll.get('partOfSpeech')], '\n'.join(elll.get('text')))
+                 for elll in ell] for ell in [el.get('definitions') for el in self._json_data]]
+
+    @_memoized_property
+    def _meaning0(self):
+        return [['{}'.format('\n'.join(elll.get('text'))) for elll in ell] for ell in
+                [el.get('definitions') for el in self._json_data]]
+
+    def _senses(self):
+        """Yields (part of speech, sense, {language: translations}) for every translated sense."""
+        for element in self._json_data:  # usually only one element
             for definition in element.get('definitions'):
                 part_of_speech = PARTS_OF_SPEECH_DICT[definition.get('partOfSpeech')]
-                translations = definition.get('translations')
-                for sense in translations:
-                    sense_value = sense.get('sense')
-                    languages = sense.get('translations')
-                    self.items.append(list(languages.items()))
-                    for lang, lang_value in languages.items():
-                        if isinstance(lang_value, dict):
-                            for descr, descr_value in lang_value.items():
-                                descr_without_lang = descr.replace(lang + ' ', '').replace(' ' + lang, '')
-                                lang_descr = lang + '-' + descr_without_lang
-                                self._update_single_entry(lang_descr, part_of_speech, sense_value, descr_value)
-                        else:
-                            self._update_single_entry(lang, part_of_speech, sense_value, lang_value)
-        for key in self._translation_txt:
-            self._translation_txt[key] = self._translation_txt[key].replace('\n', '', 1) + '\n'
-        self._languages = sorted(list(self._translation_txt.keys()))
-
-    def _update_single_entry(self, key, part_of_speech, sense, value):
-        self._translation_lst[key][self._dictionary_entry(part_of_speech, sense)] = self._force_comma_str(value)
-        self._translation_txt[key] += '\n' + self._dictionary_entry(part_of_speech, sense, value)
+                for sense in definition.get('translations'):
+                    yield part_of_speech, sense.get('sense'), sense.get('translations')
+
+    @_memoized_property
+    def items(self):
+        return [list(languages.items()) for _, _, languages in self._senses()]
+
+    @_memoized_property
+    def _translation_keys(self):
+        """{translation key: [(part of speech, sense, translations), ...] in page order}, where keys are either
+        languages, or 'language-description' for the descriptions (e.g. dialects) of a language.
+        The entries only reference the json: their texts are put together on demand."""
+        keys = defaultdict(list)
+        for part_of_speech, sense_value, languages in self._senses():
+            for lang, lang_value in languages.items():
+                if isinstance(lang_value, dict):
+                    for descr, descr_value in lang_value.items():
+                        keys[self._description_key(lang, descr)].append((part_of_speech, sense_value, descr_value))
+                else:
+                    keys[lang].append((part_of_speech, sense_value, lang_value))
+        return keys
+
+    @_memoized_property
+    def _languages(self):
+        return sorted(self._translation_keys)
+
+    def _keys_with_prefix(self, prefix):
+        """Yields the (sorted) translation keys that start with `prefix`, found by bisection."""
+        keys = self._languages
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield keys[position]
+            position += 1
+
+    def translations_for(self, prefix):
+        """Returns the translations into every language (or dialect) whose key starts with `prefix`,
+        e.g. 'norwegian' for 'norwegian bokmål', 'norwegian nynorsk'... or 'chinese' for 'chinese-mandarin'...
+        Output format:
+            {key: [TranslationEntry(part_of_speech, sense, translations), ...], ...}, sorted by key.
+        """
+        return OrderedDict((key, [TranslationEntry(*entry) for entry in self._translation_entries(key)])
+                           for key in self._keys_with_prefix(prefix.lower()))
 
+    @classmethod
+    def _description_key(cls, lang, descr):
+        descr_without_lang = descr.replace(lang + ' ', '').replace(' ' + lang, '')
+        return lang + '-' + descr_without_lang
+
+    def _translation_entries(self, key):
+        """Returns [(part of speech, sense, translations), ...] of a translation key, in page order."""
+        return self._translation_keys.get(key, [])
+
+    def _translation_text(self, key):
+        """Text of the translations of a translation key (built once per key)."""
+        text = self._translation_texts.get(key)
+        if text is None:
+            text = ''.join('\n' + self._dictionary_entry(part_of_speech, sense, value)
+                           for part_of_speech, sense, value in self._translation_entries(key))
+            text = self._translation_texts[key] = text.replace('\n', '', 1) + '\n'
+        return text
+
+    @_memoized_property
+    def _translation_lst(self):
+        translation_lst = defaultdict(dict)
+        for key in self._translation_keys:
+            for part_of_speech, sense, value in self._translation_entries(key):
+                translation_lst[key][self._dictionary_entry(part_of_speech, sense)] = self._force_comma_str(value)
+        return translation_lst
+
+    @_memoized_property
+    def _translation_txt(self):
+        translation_txt = defaultdict(str)
+        for key in self._translation_keys:
+            translation_txt[key] = self._translation_text(key)
+        return translation_txt
 
     @classmethod
     def _dictionary_entry(cls, part_of_speech, sense, value=None):
@@ -56,7 +143,7 @@ class Word:
 
     @classmethod
     def _force_comma_str(cls, value):
-        if isinstance(value, list):
+        if isinstance(value, (list, tuple)):
             return ', '.join(value)
         elif isinstance(value, str):
             return value
@@ -73,10 +160,9 @@ class Word:
         if args == ():
             args = self._languages
         for arg in args:
-            for lang in self._languages:
-                if lang.startswith(arg):
-                    print('\t>>', lang)
-                    print(self._translation_txt.get(lang), flush=True)
+            for lang in self._keys_with_prefix(arg):
+                print('\t>>', lang)
+                print(self._translation_text(lang), flush=True)
 
     # Attempting to sort languages as in, e.g.
     # lang
@@ -98,7 +184,7 @@ class Word:
         for arg in args:
             for lang in langs:
                 if lang.startswith(arg):
-                    temp.append((lang, self._translation_txt.get(lang)))
+                    temp.append((lang, self._translation_text(lang)))
                     langs.remove(lang)
 
         temp = sorted(temp, lambda el: el[0])
@@ -114,13 +200,19 @@ class Word:
             print('\t>> {}\n{}'.format(key, val))
 
 
+# Result records are slotted (no per-instance dict), since many of them may be held in memory.
+# Their json can be cached with to_json(cache=True), as long as they are not modified afterwards.
+
 class WordData(object):
+    __slots__ = ('etymology', '_definition_list', 'pronunciations', 'audio_links', '_json')
+
     def __init__(self, etymology=None, definitions=None, pronunciations=None,
                  audio_links=None):
         self.etymology = etymology if etymology else ''
         self.definition_list = definitions
         self.pronunciations = pronunciations if pronunciations else []
         self.audio_links = audio_links if audio_links else []
+        self._json = None
 
     @property
     def definition_list(self):
@@ -139,18 +231,25 @@ class WordData(object):
                     raise TypeError('Invalid type for definition')
             self._definition_list = definitions
 
-    def to_json(self):
-        return {
+    def to_json(self, cache=False):
+        if self._json is not None:
+            return self._json
+        json_obj = {
             'etymology': self.etymology,
-            'definitions': [definition.to_json() for definition in self._definition_list],
+            'definitions': [definition.to_json(cache) for definition in self._definition_list],
             'pronunciations': {
                 'text': self.pronunciations,
                 'audio': self.audio_links
             }
         }
+        if cache:
+            self._json = json_obj
+        return json_obj
 
 
 class Definition(object):
+    __slots__ = ('part_of_speech', 'text', '_related_words', 'example_uses', '_translations', '_json')
+
     def __init__(self, part_of_speech = None, text = None,
                  related_words = None, example_uses = None, translations = None):
         self.part_of_speech = part_of_speech if part_of_speech else ''
@@ -158,6 +257,7 @@ class Definition(object):
         self._related_words = related_words if related_words else []
         self.example_uses = example_uses if example_uses else []
         self._translations = translations if translations else []
+        self._json = None
 
     @property
     def related_words(self):
@@ -203,17 +303,24 @@ class Definition(object):
                         raise TypeError('Invalid type for translation')
                 self._translations.append(translation_sense)
 
-    def to_json(self):
-        return {
+    def to_json(self, cache=False):
+        if self._json is not None:
+            return self._json
+        json_obj = {
             'partOfSpeech': self.part_of_speech,
             'text': self.text,
             'relatedWords': [related_word.to_json() for related_word in self.related_words],
             'examples': self.example_uses,
             'translations': [sense.to_json() for sense in self.translations],
         }
+        if cache:
+            self._json = json_obj
+        return json_obj
 
 
 class RelatedWord(object):
+    __slots__ = ('relationship_type', 'words')
+
     def __init__(self, relationship_type=None, words=None):
         self.relationship_type = relationship_type if relationship_type else ''
         self.words = words if words else []
@@ -226,6 +333,8 @@ class RelatedWord(object):
 
 
 class TranslationSense(object):
+    __slots__ = ('sense', 'translations')
+
     def __init__(self, sense=None, translation_dict=None):
         self.sense = sense if sense else ''
         self.translations = translation_dict if translation_dict else {}